@@ -15,7 +15,7 @@ from .wildparse.argparse import SUPPRESS, CustomHelpFormat
 from .args import MyHelpFormatter
 
 from .conv import bbc_to_unicode, unicode_to_bbc
-from .misc import json_dumps, xml_dumps, get_digest, is_mmb_file
+from .misc import json_dump, xml_dump, get_digest, is_mmb_file
 from .simplewarn import warn
 
 from .enums import ListFormat, OpenMode, WarnMode, SizeOption, InfMode
@@ -587,9 +587,11 @@ class _ListProcess(_Process):
                     warn(err)
                     continue
         if self.fmt == ListFormat.JSON:
-            print(json_dumps(self.tree), end='\n')
+            json_dump(self.tree, sys.stdout)
+            sys.stdout.write('\n')
         if self.fmt == ListFormat.XML:
-            print(xml_dumps(self.tree, self.root_node))
+            xml_dump(self.tree, self.root_node, sys.stdout)
+            sys.stdout.write('\n')
 
 
 def _list_command(namespace, _parser):
@@ -3,7 +3,7 @@
 from .misc import bchr
 
 BBC_POUND = "`"
-UNICODE_POUND = bchr(0xa3).decode("iso8859-1")
+UNICODE_POUND = bchr[0xa3].decode("iso8859-1")
 
 
 def bbc_to_unicode(string: str) -> str:
@@ -1,13 +1,15 @@
 """Access to single file entry structure in disk catalog sectors."""
 
-import hashlib
-from typing import Optional, Union, Sequence, Dict, IO
+import string
+
+from typing import Optional, Union, Sequence, Dict, IO, Callable, Tuple
 from typing import cast
 
 from .simplewarn import warn
 from .consts import SECTOR_SIZE, CATALOG_SECTORS
 from .enums import DigestMode, ListFormat, ListFormatUnion
 from .misc import bchr, ValidationWarning, LazyString, json_dumps, xml_dumps
+from .misc import new_hash
 from .conv import bbc_to_unicode, unicode_to_bbc
 
 from .pattern import ParsedPattern, PatternList, PatternUnion
@@ -40,6 +42,9 @@ class Entry:
         "{sha1_data}"
         )
 
+    # TABLE_FORMAT split into (literal, field, spec, conversion) segments
+    _TABLE_SEGMENTS = tuple(string.Formatter().parse(TABLE_FORMAT))
+
     def __init__(self, side: SideProtocol, index: int,
                  entry1: memoryview, entry2: memoryview) -> None:
         """Construct 'Catalog' object referencing catalog sectors of a disk image side.
@@ -47,8 +52,8 @@ class Entry:
         Args:
             side: Parent 'Side' object.
             index: File entry index in range 0 - 30.
-            entry1: A 'memoryview' to file entry part in first catalog sector.
-            entry2: A 'memoryview' to file entry part in second catalog sector.
+            entry1: A 'memoryview' of format 'B' to file entry part in first catalog sector.
+            entry2: A 'memoryview' of format 'B' to file entry part in second catalog sector.
         """
         #: :class:`Side`: Parent Side object
         self.side = side
@@ -58,6 +63,9 @@ class Entry:
         self.entry2 = entry2
         self.__name_cache: Optional[bytes] = None
         self.__name_seq: Optional[int] = None
+        # Digests computed since the last image modification
+        self.__digest_cache: Dict[Tuple[DigestMode, str], str] = {}
+        self.__digest_seq: Optional[int] = None
 
     @staticmethod
     def _isnamechar(char: int) -> bool:
@@ -78,7 +86,7 @@ class Entry:
     def directory_bytes(self) -> bytes:
         """bytes: File directory name as raw byte.
         """
-        return bchr(self.entry1[7] & 127)
+        return bchr[self.entry1[7] & 127]
 
     @directory_bytes.setter
     def directory_bytes(self, value: bytes) -> None:
@@ -227,7 +235,7 @@ class Entry:
 
         """
         if self.__name_cache is None or self.__name_seq != self.side.image.mod_seq:
-            dirname = bchr(self.entry1[7] & 127).translate(Entry.SORTING_TRANSLATION)
+            dirname = bchr[self.entry1[7] & 127].translate(Entry.SORTING_TRANSLATION)
             filename = bytes(x & 127 for x in self.entry1[0:7]).translate(Entry.SORTING_TRANSLATION)
             self.__name_cache = dirname + filename
             self.__name_seq = self.side.image.mod_seq
@@ -399,16 +407,24 @@ class Entry:
             algorithm = 'sha1'
         if mode is None:
             mode = DigestMode.FILE
-        data = self.readall()
-        loadbytes = (self.load_address & 0x3FFFF).to_bytes(3, 'little')
-        execbytes = (self.exec_address & 0x3FFFF).to_bytes(3, 'little')
-        locked = self.locked
-        if mode in (DigestMode.ALL, DigestMode.USED):
-            data = b''.join((loadbytes, execbytes, bchr(locked), data))
-        elif mode == DigestMode.FILE:
-            data = b''.join((loadbytes, execbytes, data))
-        return hashlib.new(algorithm, data,
-                           usedforsecurity=False).hexdigest()  # type: ignore[call-arg]
+        seq = self.side.image.mod_seq
+        if self.__digest_seq != seq:
+            self.__digest_cache.clear()
+            self.__digest_seq = seq
+        key = (mode, algorithm)
+        hexdigest = self.__digest_cache.get(key)
+        if hexdigest is not None:
+            return hexdigest
+        digest = new_hash(algorithm)
+        if mode != DigestMode.DATA:
+            digest.update((self.load_address & 0x3FFFF).to_bytes(3, 'little'))
+            digest.update((self.exec_address & 0x3FFFF).to_bytes(3, 'little'))
+            if mode != DigestMode.FILE:
+                digest.update(bchr[self.locked])
+        self.get_sectors()._update_digest(digest)
+        hexdigest = digest.hexdigest()
+        self.__digest_cache[key] = hexdigest
+        return hexdigest
 
     @property
     def sha1(self) -> str:
@@ -453,7 +469,7 @@ class Entry:
         self.entry1[:] = bytes(8)  # type: ignore
         self.entry2[:] = bytes(8)  # type: ignore
 
-    def validate(self, warnall: bool = False) -> bool:
+    def validate(self, warnall: bool = False, fmt: Optional[Callable] = None) -> bool:
         """Validate catalog entry.
 
         Validate file name and start and end sectors. Issue a warning and return
@@ -461,30 +477,31 @@ class Entry:
 
         Args:
             warnall (bool): Report all problems, not just the first encountered.
+            fmt: Warning format function. See :func:`simplewarn.warn`.
         Returns:
             A boolean indicating if entry is valid.
         """
         isvalid = True
         if any(not Entry._isnamechar(x) for x in self.entry1[0:7]):
             warn(ValidationWarning("Invalid file name in catalog entry #%d" %
-                                   (self.index + 1)))
+                                   (self.index + 1)), fmt)
             # Invalid file names happen. Issue warning, but don't invalidate disk.
             # isvalid = False
         if (isvalid or warnall) and not Entry._isnamechar((self.entry1[7] & 127)):
             warn(ValidationWarning("Invalid directory name in catalog entry #%d" %
-                                   (self.index + 1)))
+                                   (self.index + 1)), fmt)
             # Invalid file names happen. Issue warning, but don't invalidate disk.
             # isvalid = False
         if (isvalid or warnall) and (self.start_sector > self.side.number_of_sectors
                                      or self.start_sector < CATALOG_SECTORS):
             warn(ValidationWarning("Invalid start sector (%d) in catalog entry #%d" %
-                                   (self.start_sector, self.index + 1)))
+                                   (self.start_sector, self.index + 1)), fmt)
             isvalid = False
         if (isvalid or warnall) and (self.end_sector > self.side.number_of_sectors
                                      or self.end_sector < CATALOG_SECTORS
                                      or self.end_sector < self.start_sector):
             warn(ValidationWarning("Invalid end sector (%d) in catalog entry #%d" %
-                                   (self.start_sector, self.index + 1)))
+                                   (self.start_sector, self.index + 1)), fmt)
             isvalid = False
         return isvalid
 
@@ -571,52 +588,25 @@ class Entry:
         Returns:
             Dictionary of file properties.
         """
-        access = "L" if self.locked else ""
+        if not for_format:
+            return self._get_dump_properties(level)
 
         attrs = {
             'index': self.index + 1,
             'fullname': self.fullname,
             'load_addr': self.load_address,
             'exec_addr': self.exec_address,
-            'access': access,      # "L" or ""
+            'access': "L" if self.locked else "",  # "L" or ""
             'size': self.size,
             'start_sector': self.start_sector,
             'sectors': self.sectors_count,
-            'sha1': LazyString(cast(Property[Entry, str],  # pylint: disable=no-member
-                                    Entry.sha1).fget, self),
-            'sha1_data': LazyString(cast(Property[Entry, str],  # pylint: disable=no-member
-                                         Entry.sha1data).fget, self),
-            'sha1_all': LazyString(cast(Property[Entry, str],  # pylint: disable=no-member
-                                        Entry.sha1all).fget, self)
+            'sha1': LazyString(_SHA1_FGET, self),
+            'sha1_data': LazyString(_SHA1DATA_FGET, self),
+            'sha1_all': LazyString(_SHA1ALL_FGET, self)
             }
 
         if level == 0:
-            image = self.side.image
-            ids: Dict = {
-                'image_path': image.path,
-                'image_filename': image.filename,
-                'image_basename': image.basename
-            }
-            if for_format or not image.is_mmb:
-                ids['side'] = self.head + 1
-            if for_format or image.is_mmb:
-                ids['image_index'] = image.index
-            if for_format:
-                ids['image_index_or_head'] = image.index if image.is_mmb else self.side.head
-                ids['image_displayname'] = ("%s:%d" % (image.filename, self.side.head)
-                                            if image.heads > 1
-                                            else image.displayname)
-
-            attrs = {**ids, **attrs}
-
-        if not for_format:
-            attrs["load_addr"] = "%06X" % cast(int, attrs["load_addr"])
-            attrs["exec_addr"] = "%06X" % cast(int, attrs["exec_addr"])
-            attrs["size"] = "%06X" % cast(int, attrs["size"])
-            attrs["sha1"] = str(attrs["sha1"])
-            attrs["sha1_data"] = str(attrs["sha1_data"])
-            attrs["sha1_all"] = str(attrs["sha1_all"])
-            return attrs
+            attrs = {**self._get_image_ids(True), **attrs}
 
         directory = self.directory
         dirstr = directory + '.' if directory != self.side.image.current_dir else ''
@@ -632,7 +622,47 @@ class Entry:
             'end_sector': self.end_sector
         }
 
-        return {**attrs, **redund_attrs}
+        attrs.update(redund_attrs)
+        return attrs
+
+    def _get_dump_properties(self, level: int) -> Dict[str, object]:
+        """Get dictionary of file properties for dump, see :meth:`get_properties`."""
+        attrs = {
+            'index': self.index + 1,
+            'fullname': self.fullname,
+            'load_addr': "%06X" % self.load_address,
+            'exec_addr': "%06X" % self.exec_address,
+            'access': "L" if self.locked else "",  # "L" or ""
+            'size': "%06X" % self.size,
+            'start_sector': self.start_sector,
+            'sectors': self.sectors_count,
+            'sha1': self.sha1,
+            'sha1_data': self.sha1data,
+            'sha1_all': self.sha1all
+            }
+
+        if level == 0:
+            return {**self._get_image_ids(False), **attrs}
+        return attrs
+
+    def _get_image_ids(self, for_format: bool) -> Dict[str, object]:
+        """Get dictionary of image and side identifying properties."""
+        image = self.side.image
+        ids: Dict = {
+            'image_path': image.path,
+            'image_filename': image.filename,
+            'image_basename': image.basename
+        }
+        if for_format or not image.is_mmb:
+            ids['side'] = self.head + 1
+        if for_format or image.is_mmb:
+            ids['image_index'] = image.index
+        if for_format:
+            ids['image_index_or_head'] = image.index if image.is_mmb else self.side.head
+            ids['image_displayname'] = ("%s:%d" % (image.filename, self.side.head)
+                                        if image.heads > 1
+                                        else image.displayname)
+        return ids
 
     def listing_entry(self, fmt: ListFormatUnion = None) -> str:
         """Generate catalog listing entry line according to selected format.
@@ -644,8 +674,9 @@ class Entry:
         if fmt is None:
             fmt = ListFormat.INFO
         if fmt == ListFormat.TABLE:
-            fmt = Entry.TABLE_FORMAT
-        if not isinstance(fmt, str):
+            attrs = self.get_properties(for_format=True, level=0)
+            line = Entry._format_table_row(attrs)
+        elif not isinstance(fmt, str):
             if fmt == ListFormat.RAW:
                 line = self.fullname
             elif fmt == ListFormat.INFO:
@@ -677,6 +708,16 @@ class Entry:
 
         return line
 
+    @staticmethod
+    def _format_table_row(attrs: Dict[str, object]) -> str:
+        """Format properties with precompiled :data:`TABLE_FORMAT` segments."""
+        parts = []
+        for literal, field, spec, _ in Entry._TABLE_SEGMENTS:
+            parts.append(literal)
+            if field is not None:
+                parts.append(format(attrs[field], spec))
+        return ''.join(parts)
+
     @property
     def info(self) -> str:
         """str: Info listing line."""
@@ -726,9 +767,8 @@ class Entry:
                 return False
 
         # If directory is not empty, is must match this file
-        directory = self._get_directory(True)
-        if pattern.dirname is not None:
-            if pattern.dirname.match(directory) is None:
+        if pattern.match_dirname is not None:
+            if pattern.match_dirname(self._get_directory(True)) is None:
                 return False
 
         # Otherwise this file must be in default directory
@@ -736,7 +776,7 @@ class Entry:
             if self.directory != unicode_to_bbc(self.side.image.current_dir):
                 return False
 
-        if pattern.filename.match(self._get_filename(True)) is None:
+        if pattern.match_filename(self._get_filename(True)) is None:
             return False
 
         pattern.match_count += 1
@@ -748,6 +788,9 @@ class Entry:
         """Test whether the entry matches any on the parsed pattern list."""
         if parsed_patterns is None:
             return default_head is None or default_head == self.head
+        match_any = parsed_patterns.match_any_filename
+        if match_any is not None and match_any(self._get_filename(True)) is None:
+            return False
         return sum(self._match(parsed, default_head)
                    for parsed in parsed_patterns.patterns) != 0
 
@@ -801,3 +844,11 @@ class Entry:
     def _set_word(buffer: memoryview, value: int) -> None:
         """Write unsigned short integer value to two-bytes buffer in little-endian byte order."""
         buffer[:] = value.to_bytes(2, 'little')  # type: ignore
+
+
+# Digest property getters for lazy evaluation in Entry.get_properties
+# pylint: disable=no-member
+_SHA1_FGET = cast(Property[Entry, str], Entry.sha1).fget
+_SHA1DATA_FGET = cast(Property[Entry, str], Entry.sha1data).fget
+_SHA1ALL_FGET = cast(Property[Entry, str], Entry.sha1all).fget
+# pylint: enable=no-member
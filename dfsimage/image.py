@@ -2,7 +2,6 @@
 
 import os
 import sys
-import hashlib
 import itertools
 import fnmatch
 import re
@@ -16,7 +15,7 @@ from typing import cast, overload
 from .simplewarn import warn
 
 from .consts import SECTORS, SECTOR_SIZE, TRACK_SIZE
-from .consts import SINGLE_TRACKS, DOUBLE_TRACKS, CATALOG_SECTORS
+from .consts import SINGLE_TRACKS, DOUBLE_TRACKS, CATALOG_SECTORS, CATALOG_SECTOR1
 from .consts import MMB_INDEX_ENTRY_SIZE, MMB_INDEX_SIZE
 from .consts import MMB_MAX_ENTRIES, MMB_DISK_SIZE
 from .consts import MMB_STATUS_UNLOCKED
@@ -24,9 +23,9 @@ from .consts import MMB_STATUS_UNLOCKED
 from .enums import SizeOption, ListFormat, OpenMode, WarnMode
 from .enums import InfMode, TranslationMode
 from .enums import ListFormatUnion
-from .misc import bchr, copydoc, LazyString, json_dumps, xml_dumps
+from .misc import bchr, copydoc, LazyString, json_dump, xml_dump
 from .misc import DFSWarning, ValidationWarning
-from .misc import is_mmb_file
+from .misc import is_mmb_file, new_hash
 from .conv import unicode_to_bbc, NAME_SAFE_TRANS, NAME_STD_TRANS
 
 from .pattern import ParsedPattern, PatternList, PatternUnion
@@ -147,10 +146,10 @@ class Image:
         self._validate_image_parameters(side_index)
 
         self.sectors_per_head = self.tracks * SECTORS
-        # self._data = bytearray(bchr(0xE5) * (self.heads * self.tracks * TRACK_SIZE))
-        data = (bytearray(bchr(0xE5) * (self.heads * self.tracks * TRACK_SIZE))
+        # self._data = bytearray(bchr[0xE5] * (self.heads * self.tracks * TRACK_SIZE))
+        data = (bytearray(bchr[0xE5] * (self.heads * self.tracks * TRACK_SIZE))
                 if not self.catalog_only
-                else bytearray(bchr(0xE5) * CATALOG_SECTORS * SECTOR_SIZE))
+                else bytearray(bchr[0xE5] * CATALOG_SECTORS * SECTOR_SIZE))
         self._dataview = memoryview(data)
         self._data_offset = 0
         self._default_head: Optional[int] = side_index if self.heads != 1 else 0
@@ -298,7 +297,7 @@ class Image:
             raise RuntimeError("%s: disk image too small" % self.filename)
 
         catalog_data = bytearray(CATALOG_SECTORS * SECTOR_SIZE)
-        with open(self.path, 'rb') as file:
+        with open(self.path, 'rb', buffering=0) as file:
             file.readinto(catalog_data)  # type: ignore[attr-defined]
 
         sectors = catalog_data[263] + ((catalog_data[262] & 3) << 8)
@@ -341,10 +340,17 @@ class Image:
                                        % (self.filename, self._sides_and_tracks_str()))
 
     def _load_mmb_entry(self):
-        if self._mmb_entry.owner is None:
-            self.file.seek(self._mmb_entry._offset, SEEK_SET)
-            if self.file.readinto(  # type: ignore[attr-defined]
-                    self._mmb_entry._dataview) != MMB_INDEX_ENTRY_SIZE:
+        entry = self._mmb_entry
+        if entry.owner is None:
+            if hasattr(os, 'pread'):
+                # Read index entry directly, without filling the read buffer
+                data = os.pread(self.file.fileno(), MMB_INDEX_ENTRY_SIZE, entry._offset)
+                count = len(data)
+                entry._dataview[:count] = data  # type: ignore
+            else:
+                self.file.seek(entry._offset, SEEK_SET)
+                count = self.file.readinto(entry._dataview)  # type: ignore[attr-defined]
+            if count != MMB_INDEX_ENTRY_SIZE:
                 raise RuntimeError("unexpected index short read")
 
     def _load_image(self, warn_mode: Optional[WarnMode], open_mode: OpenMode):
@@ -561,6 +567,12 @@ class Image:
             for side in self.sides:
                 side._csector1 = cast(memoryview, None)
                 side._csector2 = cast(memoryview, None)
+                side._cdata = cast(bytearray, None)
+                side._entries = cast(List[Optional[Entry]], None)
+                side._header_cache = None
+                side._digest_cache.clear()
+                side._name_index = None
+                side._extents_cache = None
                 side.image = cast(ImageProtocol, None)
             self.sides = cast(Tuple[Side, ...], None)
 
@@ -730,11 +742,14 @@ class Image:
         if value:
             if self.is_read_only:
                 raise PermissionError("image open for read only")
-            if self.locked:
-                raise PermissionError("image is locked")
-            if not self.initialized:
-                raise PermissionError("image is not initialized. "
-                                      "use 'drestore' or 'format'")
+            # Only images inside MMB file can be locked or uninitialized
+            mmb_entry = self._mmb_entry
+            if mmb_entry is not None:
+                if mmb_entry.locked:
+                    raise PermissionError("image is locked")
+                if not mmb_entry.initialized:
+                    raise PermissionError("image is not initialized. "
+                                          "use 'drestore' or 'format'")
             self.mod_seq += 1
         self._modified = value
 
@@ -827,6 +842,22 @@ class Image:
         track, sector = Image._logical_to_physical(logical_sector)
         return self._sector_start(head, track, sector) + SECTOR_SIZE
 
+    def _catalog_sectors(self, head: int) -> Tuple[memoryview, memoryview, int]:
+        """Get views of both catalog sectors and offset of the first one.
+
+        Catalog sectors are adjacent on track 0, so both views are sliced from
+        a single view cast to unsigned bytes.
+
+        Args:
+            head: Floppy side - 0 or 1.
+        Returns:
+            Views of the first and the second catalog sector, and offset to
+            start of the first catalog sector.
+        """
+        start = self._logical_sector_start(head, CATALOG_SECTOR1)
+        catalog = self._get_data(start, start + CATALOG_SECTORS * SECTOR_SIZE).cast('B')
+        return catalog[:SECTOR_SIZE], catalog[SECTOR_SIZE:], start
+
     def _get_data(self, start: int, end: int) -> memoryview:
         self._not_closed()
         if start < self._data_offset or end > self._data_offset + len(self._dataview):
@@ -1509,11 +1540,13 @@ class Image:
         if fmt == ListFormat.JSON:
             attrs = self.get_properties(for_format=False, recurse=True,
                                         pattern=parsed, sort=sort, silent=silent)
-            print(json_dumps(attrs), file=file)
+            json_dump(attrs, file)
+            file.write('\n')
         elif fmt == ListFormat.XML:
             attrs = self.get_properties(for_format=False, recurse=True,
                                         pattern=parsed, sort=sort, silent=silent)
-            print(xml_dumps(attrs, "image"), file=file)
+            xml_dump(attrs, "image", file)
+            file.write('\n')
         else:
             heads = self._get_heads_from_pattern(parsed)
             for head in heads:
@@ -1575,8 +1608,9 @@ class Image:
             algorithm = 'sha1'
         size = self._get_size_for_save()
         data = self._get_data(0, size)
-        return hashlib.new(algorithm, data,
-                           usedforsecurity=False).hexdigest()  # type: ignore[call-arg]
+        digest = new_hash(algorithm)
+        digest.update(data)
+        return digest.hexdigest()
 
     @property
     def sha1(self) -> str:
@@ -1673,14 +1707,18 @@ class Image:
         self._not_closed()
         if default_head is None:
             default_head = self._default_head
+        # Side file lists are fresh copies, so they are extended and filtered
+        # directly without iterating through Side.files
         if pattern is None:
-            return list(itertools.chain.from_iterable(
-                side.files for side in self.sides
-                if default_head is None or side.head == default_head))
+            files: List[Entry] = []
+            for side in self.sides:
+                if default_head is None or side.head == default_head:
+                    files += side._file_list()
+            return files
 
         parsed = self._compile_pattern(pattern)
         files = [file for side in self.sides
-                 for file in side.files
+                 for file in side._file_list()
                  if file._match_parsed(parsed, default_head)]
         if not silent:
             parsed.ensure_matched()
@@ -1,19 +1,54 @@
 """Classes for .inf files"""
 
-from typing import Optional, Dict, Tuple, List
+from typing import Optional, Dict, Tuple, List, Union
 from typing import cast
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 
 from .simplewarn import warn
 from .misc import InfWarning
 
 
-def _foldfilecase(dirname: str, file: str) -> str:
-    """Normalize the file name letter case the hard way for WSL."""
-    path = os.path.join(dirname, file)
+# Number of characters read from inf file at once
+_INF_READ_SIZE = 4096
+
+# Minimum number of inf files in directory to load them in parallel
+_INF_PARALLEL_MIN = 16
+# Maximum number of threads loading inf files
+_INF_MAX_WORKERS = 32
+
+# File name ends at the last space within the first 13 characters, which
+# allows spaces in names up to 12 characters long.
+_INF_SPACED_NAME_RE = re.compile(r'(.{0,12}) ', re.DOTALL)
+# File name ends at the first space.
+_INF_NAME_RE = re.compile(r'([^ ]*) ')
+# Keywords marking file as locked
+_INF_LOCK_WORDS = frozenset(('l', 'locked'))
+
+
+# Two digit upper case hex strings, indexed by byte value
+_HEX2 = tuple(f"{i:02X}" for i in range(256))
+
+
+def _hex6(value: int) -> str:
+    """Format value as at least 6 digits upper case hex number."""
+    if 0 <= value <= 0xFFFFFF:
+        return _HEX2[value >> 16] + _HEX2[(value >> 8) & 0xFF] + _HEX2[value & 0xFF]
+    return f"{value:06X}"
+
+
+def _foldfilecase(dirname: str, file: str, case_insensitive: Optional[bool] = None) -> str:
+    """Normalize the file name letter case the hard way for WSL.
+
+    If `case_insensitive` is known for the directory, file system is not queried.
+    """
     l_file = file.lower()
     if l_file == file:
         return l_file
+    if case_insensitive is not None:
+        return l_file if case_insensitive else file
+    path = os.path.join(dirname, file)
     test_path = os.path.join(dirname, l_file)
     try:
         if not os.path.samefile(path, test_path):
@@ -69,6 +104,10 @@ def canonpath(path: str) -> str:
 
 class Inf:
     """Represents Inf file contents."""
+
+    __slots__ = ('is_valid', 'inf_path', 'filename', 'load_addr', 'exec_addr',
+                 'size', 'locked', 'drive')
+
     def __init__(self):
         #: bool: Inf file data is valid
         self.is_valid = False
@@ -93,11 +132,11 @@ class Inf:
         if not self.is_valid:
             return "invalid"
 
-        parts = [f"{self.filename:<12} {self.load_addr:06X}"]
+        parts = [f"{self.filename:<12}", _hex6(self.load_addr)]
         if self.exec_addr is not None:
-            parts.append(f"{self.exec_addr:06X}")
+            parts.append(_hex6(self.exec_addr))
         if self.size is not None:
-            parts.append(f"{self.size:06X}")
+            parts.append(_hex6(self.size))
         if self.locked:
             parts.append("Locked")
         return " ".join(parts)
@@ -111,20 +150,19 @@ class Inf:
 
         drive = ''
 
+        match = None
         if allow_spaces:
             # expect to find end of file name at position 11
             # if landed within load address, scan back for space
-            name_end = value.rfind(' ', 0, 13)
-            if name_end == -1:
-                name_end = value.find(' ')
-        else:
-            name_end = value.find(' ')
+            match = _INF_SPACED_NAME_RE.match(value)
+        if match is None:
+            match = _INF_NAME_RE.match(value)
 
         # No space in inf file
-        if name_end == -1:
+        if match is None:
             raise ValueError("invalid inf file")
 
-        name = value[:name_end].rstrip()
+        name = match.group(1).rstrip()
 
         # Empty name - i.e. inf line starts with space
         if len(name) == 0:
@@ -133,22 +171,22 @@ class Inf:
         # If name starts with drive, strip it temporarily to check
         # for directory name
         if name[0] == ':':
-            if len(name) < 3 or name[1] < '0' and name[1] > '3' or name[2] != '.':
-                raise ValueError("invalid drive name: '%s'" % name[:3])
+            if len(name) < 3 or name[1] not in '0123' or name[2] != '.':
+                raise ValueError(f"invalid drive name: '{name[:3]}'")
             drive = name[:3]
             name = name[3:]
 
         # If name doesn't start with directory name, insert '$.'
         if name[0] != '.' and (len(name) < 2 or name[1] != '.'):
-            name = '$.%s' % name
+            name = '$.' + name
 
         # Name without drive should be at most 9 characters
         if len(name) > 9:
-            raise ValueError("name too long: '%s'" % name)
+            raise ValueError(f"name too long: '{name}'")
         name = drive + name
 
         # Split line after filename
-        tail = value[name_end:].split()
+        tail = value[match.end():].split()
 
         return name, tail
 
@@ -156,11 +194,11 @@ class Inf:
     def _assign_field(cls, items, order, field, field_str, index):
         # Hex field following special keyword is invalid
         if field == -1:
-            raise ValueError("unexpected inf field at #%d: '%s'" % (index, field_str))
+            raise ValueError(f"unexpected inf field at #{index}: '{field_str}'")
 
         # More hex fields than expected
         if field >= len(order):
-            raise ValueError("too many inf fields at #%d: '%s'" % (index, field_str))
+            raise ValueError(f"too many inf fields at #{index}: '{field_str}'")
 
         # Assign consecutive hex fields
         field_name = order[field]
@@ -168,8 +206,8 @@ class Inf:
             field_value = int(field_str, 16)
         except ValueError as err:
             if len(err.args) > 0:
-                err.args = ("%s in inf field #%d (%s): '%s'" %
-                            (err.args[0], index, field_name, field_str), )
+                err.args = (f"{err.args[0]} in inf field #{index} ({field_name}): "
+                            f"'{field_str}'", )
             raise
 
         items[field_name] = field_value
@@ -204,23 +242,25 @@ class Inf:
             field = 0
 
             # Scan tail for hex values or special keywords
-            while len(tail) > index:
+            len_tail = len(tail)
+            while len_tail > index:
                 field_str = tail[index]
+                low = field_str.lower()
 
                 # Ignore CRC=xxx
-                if field_str.lower().startswith('crc=') or field_str.lower().startswith('boot='):
+                if low.startswith(('crc=', 'boot=')):
                     index += 1
                     field = -1
                     continue
 
                 # Ignore NEXT <name>
-                if field_str.lower() == 'next' and index + 1 < len(tail):
+                if low == 'next' and index + 1 < len_tail:
                     index += 2
                     field = -1
                     continue
 
                 # Accept 'l' or 'locked', don't allow any hex fields following
-                if field_str.lower() == 'l' or field_str.lower() == 'locked':
+                if low in _INF_LOCK_WORDS:
                     items["access"] = 0x19
                     index += 1
                     field = -1
@@ -273,23 +313,26 @@ class Inf:
 
     @classmethod
     def _get_inf_line(cls, path: str) -> str:
-        data: Optional[str] = None
-
-        # Allow only one line of text, don't throw if followed some empty lines
+        # Inf file is a single short line, read it in one go
         with open(path, "r") as inf_file:
-            for line in inf_file:
-                if data is None:
-                    data = line
-                elif len(line.strip()) != 0:
-                    raise ValueError('excessive lines in inf file')
+            text = inf_file.read(_INF_READ_SIZE)
+            if len(text) == _INF_READ_SIZE:
+                # Unusually large inf file, get the remaining part too
+                text += inf_file.read()
 
-        if data is None:
+        if len(text) == 0:
             raise ValueError('empty inf file')
 
+        # Allow only one line of text, don't throw if followed some empty lines
+        data, _, tail = text.partition('\n')
+        if len(tail.strip()) != 0:
+            raise ValueError('excessive lines in inf file')
+
         return data
 
     @classmethod
-    def load(cls, path: str, allow_spaces=True, no_throw=False) -> 'Inf':
+    def load(cls, path: str, allow_spaces=True, no_throw=False,
+             data_size: Optional[int] = None) -> 'Inf':
         """Load inf data from file.
 
         Args:
@@ -301,6 +344,8 @@ class Inf:
             no_throw (bool): Don't throw exception in case of invalid inf file format,
                 instead return :class:`Inf` object with :data:`Inf.is_valid`
                 property set to `False`.
+            data_size (Optional[int]): Size of the data file if already known.
+                If not provided, size is read from the file system when needed.
         Raises:
             ValueError: Invalid inf data and `no_throw` is not `True`.
             OSError: Reading inf file failed
@@ -311,10 +356,11 @@ class Inf:
             # Read inf data from first line
             inf = cls.from_string(data, allow_spaces, no_throw)
             if inf.size is not None:
-                file_size = os.path.getsize(path[:-4])
+                file_size = (data_size if data_size is not None
+                             else os.path.getsize(path[:-4]))
                 if file_size != inf.size:
-                    raise ValueError("file size in inf (%d) doesn't match actual size (%d)"
-                                     % (inf.size, file_size))
+                    raise ValueError(f"file size in inf ({inf.size}) doesn't match "
+                                     f"actual size ({file_size})")
 
             inf.inf_path = path
 
@@ -325,10 +371,21 @@ class Inf:
                 return cls()
             # Decorate exception message with inf file name
             if len(err.args) > 0:
-                err.args = ('%s: %s' % (path, err.args[0]), )
+                err.args = (f'{path}: {err.args[0]}', )
             raise
 
 
+def _load_inf_task(task: Tuple[str, str, Optional[os.DirEntry]]) -> Union[Inf, Exception]:
+    """Load single inf file for directory scan, return exception instead of raising it."""
+    _, full_path, data_entry = task
+    try:
+        # Directory entry caches stat result, no need to query size again
+        data_size = data_entry.stat().st_size if data_entry is not None else None
+        return Inf.load(full_path, no_throw=False, data_size=data_size)
+    except (ValueError, OSError) as err:
+        return err
+
+
 class _InfDirectoryCache:
     """Cache all inf files in a single directory."""
 
@@ -341,6 +398,8 @@ class _InfDirectoryCache:
         self.inf_map: Dict[str, Inf] = {}
         self.host_file_map: Dict[str, Inf] = {}
         self.dir_path = path
+        #: Optional[bool]: Directory is case insensitive, `None` if not known yet
+        self._case_insensitive: Optional[bool] = None
         if os.path.exists(path):
             self.scandir()
 
@@ -348,29 +407,50 @@ class _InfDirectoryCache:
         """Scan all inf files in directory"""
         inf_map: Dict[str, Inf] = {}
         data_map: Dict[str, str] = {}
+        inf_files: List[str] = []
+        tasks: List[Tuple[str, str, Optional[os.DirEntry]]] = []
+        dir_entries: Dict[str, os.DirEntry] = {}
 
-        # Iterate over all files in directory
+        # Collect names of all files and inf files in a single directory pass
         with os.scandir(self.dir_path) as f_iter:
             for entry in f_iter:
-                # Skip files not ending with .inf
-                # Skip inf file if there is no matching data file
-                if (not entry.is_file()
-                        or not entry.name.lower().endswith(".inf")
-                        or not os.path.exists(entry.name[:-4])):
-                    continue
+                dir_entries[entry.name] = entry
+                if entry.name.lower().endswith(".inf") and entry.is_file():
+                    inf_files.append(entry.name)
+
+        for inf_file in inf_files:
+            # Skip inf file if there is no matching data file. Fall back to
+            # checking the file system for case insensitive file names.
+            data_file = inf_file[:-4]
+            data_entry = dir_entries.get(data_file)
+            if (data_entry is None
+                    and not os.path.exists(os.path.join(self.dir_path, data_file))):
+                continue
+
+            # Convert to lower case if possible. Case sensitivity is property of
+            # the directory, so probe the file system only for the first mixed case name.
+            if self._case_insensitive is None and inf_file.lower() != inf_file:
+                self._case_insensitive = _foldfilecase(self.dir_path, inf_file) != inf_file
+            name = _foldfilecase(self.dir_path, inf_file, self._case_insensitive)
+            full_path = os.path.realpath(os.path.join(self.dir_path, inf_file))
+            tasks.append((name, full_path, data_entry))
+
+        # Reading many small files is dominated by I/O latency, so overlap it
+        # using a thread pool when directory is large enough to pay off
+        if len(tasks) > _INF_PARALLEL_MIN:
+            with ThreadPoolExecutor(max_workers=min(_INF_MAX_WORKERS, len(tasks))) as executor:
+                results = list(executor.map(_load_inf_task, tasks))
+        else:
+            results = [_load_inf_task(task) for task in tasks]
+
+        # On exception issue warning and continue
+        for (name, _, _), result in zip(tasks, results):
+            if isinstance(result, Inf):
+                inf_map[name] = result
+                data_map[name[:-4]] = name
+            elif len(result.args) > 0:
+                warn(InfWarning(result.args[0]))
 
-                # Convert to lower case if possible
-                name = _foldfilecase(self.dir_path, entry.name)
-                full_path = os.path.realpath(os.path.join(self.dir_path, entry.name))
-
-                # Try to load the file, on exception issue warning and continue
-                try:
-                    inf = Inf.load(full_path, no_throw=False)
-                    inf_map[name] = inf
-                    data_map[name[:-4]] = name
-                except (ValueError, OSError) as err:
-                    if len(err.args) > 0:
-                        warn(InfWarning(err.args[0]))
         # corner case:
         #  a, a.inf, a.inf.inf
         #  -> a is data, a.inf is data, a.inf.inf is inf
@@ -435,6 +515,22 @@ class _InfCache:
 
     def __init__(self):
         self.directory_map: Dict[str, _InfDirectoryCache] = {}
+        # Canonical paths resolved during lifetime of this cache, by path as given
+        self.canonical_paths: Dict[str, str] = {}
+
+    def canonpath(self, path: str) -> str:
+        """Get canonical file path, resolving each distinct path only once.
+
+        Args:
+            path: absolute or relative path.
+        Return:
+            Canonical path, see :func:`canonpath`.
+        """
+        canon = self.canonical_paths.get(path)
+        if canon is None:
+            canon = canonpath(path)
+            self.canonical_paths[path] = canon
+        return canon
 
     def get_directory_cache(self, path: str) -> _InfDirectoryCache:
         """Get or create per-direcotry cache.
@@ -444,7 +540,7 @@ class _InfCache:
         Return:
             Per-directory cache object.
         """
-        path = canonpath(path)
+        path = self.canonpath(path)
         cache = self.directory_map.get(path)
         if cache is not None:
             return cache
@@ -460,7 +556,7 @@ class _InfCache:
         Returns:
             Inf object if valid matching inf file exists, 'None' otherwise.
         """
-        path = canonpath(host_file)
+        path = self.canonpath(host_file)
         cache = self.get_directory_cache(os.path.dirname(path))
         return cache.get_by_host_file(os.path.basename(path))
 
@@ -472,7 +568,7 @@ class _InfCache:
         Returns:
             Inf object if valid matching inf file exists, 'None' otherwise.
         """
-        path = canonpath(inf_file)
+        path = self.canonpath(inf_file)
         cache = self.get_directory_cache(os.path.dirname(path))
         return cache.get_by_inf_file(os.path.basename(path))
 
@@ -483,6 +579,6 @@ class _InfCache:
             inf_name: Inf file - absolute or relative path.
             inf: Optional; Inf object with data in the inf file.
         """
-        path = canonpath(inf_name)
+        path = self.canonpath(inf_name)
         cache = self.get_directory_cache(os.path.dirname(path))
         cache.update(os.path.basename(inf_name), inf)
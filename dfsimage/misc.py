@@ -4,8 +4,10 @@ import os
 import json
 import xml.etree.ElementTree as ET
 import hashlib
+import functools
 
 from typing import Sequence, Optional, Union, TypeVar, List, Callable
+from typing import Tuple, IO, cast
 
 from .consts import MMB_INDEX_SIZE, MMB_SIZE, MMB_DISK_SIZE
 from .consts import MMB_MAX_ENTRIES
@@ -27,8 +29,9 @@ class InfWarning(UserWarning):
     """Warning caused by invalid data in inf file or conflicting files."""
 
 
+# Single byte 'bytes' objects, indexed by byte value.
 # pylint: disable=invalid-name
-bchr = tuple([bytes((x, )) for x in range(0, 256)]).__getitem__
+bchr: Tuple[bytes, ...] = tuple([bytes((x, )) for x in range(0, 256)])
 
 
 def rjoin(sep: Optional[str], array: Sequence[str]) -> Union[str, List[str]]:
@@ -68,20 +71,46 @@ FuncType = TypeVar('FuncType')
 class LazyString:
     """Evaluate function when conversion to string is requested."""
 
+    __slots__ = ('value', 'func', 'args')
+
     def __init__(self, func, *args) -> None:
         """Construct 'LazyString' object."""
         self.value: Optional[str] = None
-        self.func = func
-        self.args = args
+        self.func: Optional[Callable] = func
+        self.args: tuple = args
 
     def __str__(self) -> str:
         """Call the stored function."""
         if self.value is not None:
             return self.value
-        self.value = str(self.func(*self.args))
+        self.value = str(cast(Callable, self.func)(*self.args))
+        # Release function and arguments, they are not needed any more
+        self.func = None
+        self.args = ()
         return self.value
 
 
+@functools.lru_cache(maxsize=16)
+def _get_hash_constructor(algorithm: str) -> Callable:
+    """Get hash object constructor for algorithm name."""
+    if algorithm in hashlib.algorithms_guaranteed:
+        return getattr(hashlib, algorithm)
+    return functools.partial(hashlib.new, algorithm)
+
+
+def new_hash(algorithm: str = None):
+    """Create hash object, using direct constructor for guaranteed algorithms.
+
+    Args:
+        algorithm: Optional; Algorithm to use instead of the default SHA1.
+    Returns:
+        New hash object.
+    """
+    if algorithm is None:
+        return hashlib.sha1(usedforsecurity=False)  # type: ignore[call-arg]
+    return _get_hash_constructor(algorithm)(usedforsecurity=False)
+
+
 def get_digest(data, algorithm: str = None) -> str:
     """Generate hexadecimal digest of data.
 
@@ -91,10 +120,9 @@ def get_digest(data, algorithm: str = None) -> str:
     Returns:
         Hexadecimal digest string.
     """
-    if algorithm is None:
-        algorithm = 'sha1'
-    return hashlib.new(algorithm, data,
-                       usedforsecurity=False).hexdigest()  # type: ignore[call-arg]
+    digest = new_hash(algorithm)
+    digest.update(data)
+    return digest.hexdigest()
 
 
 def json_dumps(obj: object) -> str:
@@ -102,25 +130,43 @@ def json_dumps(obj: object) -> str:
     return json.dumps(obj, indent=2)
 
 
-def xml_dumps(obj: object, root_name: str) -> str:
-    """Make sure that xml modules are loaded and create xml from dictionary or list."""
+def json_dump(obj: object, file: IO) -> None:
+    """Call json.dump with correct indent, writing directly to output stream."""
+    json.dump(obj, file, indent=2)
+
+
+# Pre-built newline + indentation strings for xml_dumps, indexed by depth.
+_INDENTS = ['\n' + '  ' * i for i in range(16)]
+
+
+def _xml_indent(depth: int) -> str:
+    """Return newline followed by indentation for given depth."""
+    while depth >= len(_INDENTS):
+        _INDENTS.append('\n' + '  ' * len(_INDENTS))
+    return _INDENTS[depth]
+
+
+def _xml_tree(obj: object, root_name: str) -> ET.Element:
+    """Create xml element tree from dictionary or list."""
 
     def _xml_add(obj, element, name, indent=0) -> None:
         if isinstance(obj, dict):
-            element.text = "\n" + (indent + 1) * "  "
+            inner = _xml_indent(indent + 1)
+            element.text = inner
             child = None
             for k, v in obj.items():
                 child = ET.SubElement(element, str(k))
                 _xml_add(v, child, str(k), indent + 1)
-                child.tail = "\n" + (indent + 1) * "  "
+                child.tail = inner
             if child is not None:
-                child.tail = "\n" + indent * "  "
+                child.tail = _INDENTS[indent]
             else:
-                element.text = "\n" + indent * "  "
+                element.text = _INDENTS[indent]
 
         elif (not isinstance(obj, str) and not isinstance(obj, bytes)
               and hasattr(obj, "__iter__")):
-            element.text = "\n" + (indent + 1) * "  "
+            inner = _xml_indent(indent + 1)
+            element.text = inner
             if name[-1] == 's':
                 childname = name[:-1]
             else:
@@ -129,30 +175,50 @@ def xml_dumps(obj: object, root_name: str) -> str:
             for val in iter(obj):
                 child = ET.SubElement(element, childname)
                 _xml_add(val, child, childname, indent + 1)
-                child.tail = "\n" + (indent + 1) * "  "
+                child.tail = inner
             if child is not None:
-                child.tail = "\n" + indent * "  "
+                child.tail = _INDENTS[indent]
             else:
-                element.text = "\n" + indent * "  "
+                element.text = _INDENTS[indent]
         else:
             element.text = str(obj)
 
     root = ET.Element(root_name)
     _xml_add(obj, root, root_name)
-    return ET.tostring(root, encoding="utf-8",  # type: ignore
+    return root
+
+
+def xml_dumps(obj: object, root_name: str) -> str:
+    """Make sure that xml modules are loaded and create xml from dictionary or list."""
+    return ET.tostring(_xml_tree(obj, root_name), encoding="utf-8",  # type: ignore
                        xml_declaration=False).decode("utf-8")
 
 
+def xml_dump(obj: object, root_name: str, file: IO) -> None:
+    """Create xml from dictionary or list, writing directly to output stream."""
+    ET.ElementTree(_xml_tree(obj, root_name)).write(file, encoding="unicode",
+                                                    xml_declaration=False)
+
+
 def is_mmb_file(fname: str) -> int:
     """Check if file is MMB based on size and extension.
 
     Returns: number of images in the MMB file or 0.
     """
-    if not os.path.exists(fname):
+    try:
+        fsize = os.stat(fname).st_size
+    except (OSError, ValueError):
         return 0
 
-    fsize = os.path.getsize(fname)
-    if fname.lower().endswith(".mmb"):
+    return mmb_image_count(fname, fsize)
+
+
+def mmb_image_count(fname: str, fsize: int) -> int:
+    """Get number of images in MMB file based on its size and extension.
+
+    Returns: number of images in the MMB file or 0.
+    """
+    if fname[-4:].lower() == ".mmb":
         if (fsize < MMB_INDEX_SIZE + MMB_DISK_SIZE or fsize > MMB_SIZE or
                 (fsize - MMB_INDEX_SIZE) % MMB_DISK_SIZE != 0):
             raise ValueError("%s invalid MMB file size" % fname)
@@ -100,7 +100,7 @@ class MMBEntry:
     @status_byte.setter
     def status_byte(self, value: int):
         if self._dataview[MMB_STATUS_OFFSET] != value:  # type: ignore
-            self._modified = True
+            self.modified = True
             self._dataview[MMB_STATUS_OFFSET] = value  # type: ignore
 
     @property
@@ -169,7 +169,7 @@ class MMBEntry:
     def title(self, value: str) -> None:
         if len(value) > 12:
             raise ValueError("title too long")
-        vbytes = unicode_to_bbc(value).ljust(12, chr(0)).encode("ascii")
+        vbytes = unicode_to_bbc(value).encode("ascii").ljust(12, b"\0")
         if vbytes != self._dataview[0:12]:
             self.modified = True
             self._dataview[0:12] = vbytes  # type: ignore
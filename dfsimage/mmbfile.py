@@ -1,28 +1,40 @@
 """This module contains MMBFile class."""
 
 import os
+import mmap
 
 from io import SEEK_SET
 
-from typing import Generator, Optional, IO, Union, List, Dict
-from typing import cast
+from typing import Generator, Iterator, Optional, IO, Union, List, Dict, Tuple
+from typing import cast, TYPE_CHECKING
 
 from .consts import MMB_INDEX_SIZE, MMB_INDEX_ENTRY_SIZE, MMB_MAX_ENTRIES, MMB_SIZE
-from .consts import MMB_STATUS_UNINITIALIZED
+from .consts import MMB_STATUS_UNINITIALIZED, MMB_STATUS_UNINITIALIZED_MASK
+from .consts import MMB_STATUS_OFFSET, MMB_DISK_SIZE, SECTOR_SIZE
 
 from .enums import ListFormat, ListFormatUnion
 from .enums import WarnMode, OpenMode
 
-from .misc import is_mmb_file
+from .misc import mmb_image_count
+from .conv import bbc_to_unicode
 
-from .pattern import PatternUnion
+from .pattern import PatternUnion, PatternList
 from .mmbentry import MMBEntry
-from .image import Image
+
+if TYPE_CHECKING:
+    from .image import Image
+
+
+# Translation table mapping catalog status byte to 1 for initialized image, 0 otherwise
+_INITIALIZED_TABLE = bytes(int(status & MMB_STATUS_UNINITIALIZED_MASK != MMB_STATUS_UNINITIALIZED)
+                           for status in range(256))
 
 
 class MMBOnbootList:
     """Indexable access to images inserted into drives at boot time."""
 
+    __slots__ = ('mmb_file', )
+
     def __init__(self, mmb_file: 'MMBFile'):
         self.mmb_file = mmb_file
 
@@ -39,6 +51,8 @@ class MMBOnbootList:
 class MMBAllEntries:
     """Indexable access to all images, including uninitialized ones."""
 
+    __slots__ = ('mmb_file', )
+
     def __init__(self, mmb_file: 'MMBFile'):
         self.mmb_file = mmb_file
 
@@ -72,19 +86,22 @@ class MMBFile:
             FileExistsError: File already exists and 'create' is True.
         """
 
-        self._onboot_modified = False
-
-        if not create:
-            #: int: Maximum number of images in the **MMB** file
-            self.count = is_mmb_file(filename)
-        else:
-            self.count = MMB_MAX_ENTRIES
-
-        if self.count == 0:
-            raise ValueError("%s: not a valid MMB file" % filename)
-
-        self._dataview: Optional[memoryview] = memoryview(bytearray(MMB_INDEX_SIZE))
-        self._entry_modified = bytearray(MMB_MAX_ENTRIES)
+        #: int: Maximum number of images in the **MMB** file
+        self.count = MMB_MAX_ENTRIES
+        self._mmap: Optional[mmap.mmap] = None
+        self._dataview: Optional[memoryview] = None
+        # Low and high bytes of images inserted into drives at boot time
+        self._onboot_low = memoryview(b'')
+        self._onboot_high = memoryview(b'')
+        # Status bytes of all catalog entries, strided view into the catalog
+        self._statuses = memoryview(b'')
+        # Bit mask of modified catalog blocks, bit 0 is set for the onboot header
+        # and bit n + 1 for entry index n
+        self._dirty_bits = 0
+        # Entry objects reference the catalog memory, so they can be reused
+        self._entry_cache: List[Optional[MMBEntry]] = [None] * MMB_MAX_ENTRIES
+        self._all_entries = MMBAllEntries(self)
+        self._onboot = MMBOnbootList(self)
         #: str: Full path to the **MMB** file.
         self.path = os.path.abspath(filename)
         #: str: Name of the **MMB** file.
@@ -99,20 +116,29 @@ class MMBFile:
         #: open from this **MMB**.
         self.refcnt = 1
 
-        filemode = "xb" if create else "rb+" if for_write else "rb"
+        filemode = "xb+" if create else "rb+" if for_write else "rb"
         try:
             self.file = open(filename, filemode)
-            if not self.is_new_file:
-                if self.file.readinto(  # type: ignore[attr-defined]
-                        self._dataview) != MMB_INDEX_SIZE:
-                    raise RuntimeError("%s: unexpected MMB file short read"
-                                       % filename)
+            if self.is_new_file:
+                self.file.truncate(MMB_SIZE)
             else:
+                # Get size from already open file instead of querying the path again
+                self.count = mmb_image_count(filename, os.fstat(self.file.fileno()).st_size)
+                if self.count == 0:
+                    raise ValueError("%s: not a valid MMB file" % filename)
+            # Map catalog copy-on-write, so modifications reach the file only on save
+            self._mmap = mmap.mmap(self.file.fileno(), MMB_INDEX_SIZE, access=mmap.ACCESS_COPY)
+            self._dataview = memoryview(self._mmap)
+            self._onboot_low = self._dataview[0:4]
+            self._onboot_high = self._dataview[4:8]
+            self._statuses = self._dataview[MMB_INDEX_ENTRY_SIZE + MMB_STATUS_OFFSET:
+                                            (self.count + 1) * MMB_INDEX_ENTRY_SIZE:
+                                            MMB_INDEX_ENTRY_SIZE]
+            if self.is_new_file:
                 for entry in self.all_entries:
                     entry.status_byte = MMB_STATUS_UNINITIALIZED
                 for index in range(4):
                     self.set_onboot(index, index)
-                self.file.truncate(MMB_SIZE)
                 self.save()
 
         except:  # noqa: E722
@@ -160,7 +186,21 @@ class MMBFile:
                 self.save()
             self.file.close()
             self.file = None
+        self._entry_cache = [None] * MMB_MAX_ENTRIES
+        self._onboot_low.release()
+        self._onboot_high.release()
+        self._statuses.release()
+        if self._dataview is not None:
+            self._dataview.release()
             self._dataview = None
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Some MMBEntry objects still reference the catalog, mapping
+                # will be released together with them
+                pass
+            self._mmap = None
 
     def _not_closed(self):
         if self._dataview is None:
@@ -186,17 +226,44 @@ class MMBFile:
         elif self.refcnt == 0:
             self._close(True)
 
+    def _modified_ranges(self) -> List[Tuple[int, int]]:
+        """Get list of modified catalog byte ranges, adjacent ranges are merged."""
+        dirty = []
+        bits = self._dirty_bits
+        while bits:
+            lowest = bits & -bits
+            dirty.append(lowest.bit_length() - 1)
+            bits ^= lowest
+
+        # Sequential write of the whole catalog is cheaper when most of it changed
+        if len(dirty) > self.count // 2:
+            return [(0, MMB_INDEX_SIZE)]
+
+        ranges: List[Tuple[int, int]] = []
+        for block in dirty:
+            start = block * MMB_INDEX_ENTRY_SIZE
+            end = start + MMB_INDEX_ENTRY_SIZE
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+
     def save(self):
-        """Save the **MMB** file catalog."""
-        self.file.seek(0, SEEK_SET)
-        if self.file.write(self._dataview) != MMB_INDEX_SIZE:
-            raise IOError("%s: failed to write index" % self.filename)
+        """Save the **MMB** file catalog.
+
+        Only modified catalog entries are written.
+        """
+        for start, end in self._modified_ranges():
+            self.file.seek(start, SEEK_SET)
+            if self.file.write(self._dataview[start:end]) != end - start:  # type: ignore
+                raise IOError("%s: failed to write index" % self.filename)
         self.clear_modified()
 
     @property
     def modified(self):
         """The **MMB** file catalog has been modified since last save."""
-        return self._onboot_modified or any(b != 0 for b in self._entry_modified)
+        return self._dirty_bits != 0
 
     def is_entry_modified(self, index: int) -> bool:
         """Get catalog entry modified flag.
@@ -206,7 +273,7 @@ class MMBFile:
         Returns:
             Modified flag value
         """
-        return self._entry_modified[index] != 0
+        return (self._dirty_bits >> (index + 1)) & 1 != 0
 
     def set_entry_modified(self, index: int, value: bool):
         """Set catalog entry modified flag.
@@ -219,12 +286,13 @@ class MMBFile:
             if self.is_read_only:
                 raise PermissionError("%s: file is open for read only"
                                       % self.filename)
-        self._entry_modified[index] = value
+            self._dirty_bits |= 2 << index
+        else:
+            self._dirty_bits &= ~(2 << index)
 
     def clear_modified(self):
         """Clear all modified flags after catalog has been saved."""
-        self._entry_modified.clear()
-        self._onboot_modified = False
+        self._dirty_bits = 0
 
     def incref(self) -> IO[bytes]:
         """Increment reference count and return IO object."""
@@ -242,8 +310,7 @@ class MMBFile:
         self._not_closed()
         if drive < 0 or drive > 3:
             raise IndexError("index out of range")
-        dataview = cast(memoryview, self._dataview)
-        return dataview[drive] | (dataview[drive + 4] << 8)
+        return self._onboot_low[drive] | (self._onboot_high[drive] << 8)
 
     def set_onboot(self, drive: int, image: int):
         """Set index of image inserted into drive at boot time.
@@ -260,10 +327,9 @@ class MMBFile:
         if self.is_read_only:
             raise PermissionError("%s: file is open for read only"
                                   % self.filename)
-        dataview = cast(memoryview, self._dataview)
-        dataview[drive] = image & 0xFF  # type: ignore
-        dataview[drive + 4] = image >> 8  # type: ignore
-        self._onboot_modified = True
+        self._onboot_low[drive] = image & 0xFF  # type: ignore
+        self._onboot_high[drive] = image >> 8  # type: ignore
+        self._dirty_bits |= 1
 
     def get_entry(self, index: int) -> MMBEntry:
         """Get n-th image entry.
@@ -274,31 +340,35 @@ class MMBFile:
             An :class:`MMBEntry` object referencing the image.
         """
         self._not_closed()
-        offset = (index + 1) * MMB_INDEX_ENTRY_SIZE
-        dataview = cast(memoryview, self._dataview)
-        return MMBEntry(index=index,
-                        dataview=dataview[offset:offset + MMB_INDEX_ENTRY_SIZE],
-                        owner=self)
+        if index < 0 or index >= MMB_MAX_ENTRIES:
+            raise IndexError("index out of range")
+        entry = self._entry_cache[index]
+        if entry is None:
+            offset = (index + 1) * MMB_INDEX_ENTRY_SIZE
+            entry = MMBEntry(index=index,
+                             dataview=self._dataview[  # type: ignore[index]
+                                 offset:offset + MMB_INDEX_ENTRY_SIZE],
+                             owner=self)
+            self._entry_cache[index] = entry
+        return entry
 
     @property
     def all_entries(self) -> MMBAllEntries:
         """:class:`MMBAllEntries`: Sequence of all disk image entries."""
-        return MMBAllEntries(self)
+        return self._all_entries
 
     @property
     def entries(self) -> Generator[MMBEntry, None, None]:
         """Generator[:class:`MMBEntry`, None, None]: Sequence of initialized disk image entries."""
-        index = 0
-        while index < self.count:
-            entry = self.get_entry(index)
-            if entry.initialized:
-                yield entry
-            index += 1
+        self._not_closed()
+        for index, status in self._iter_status_bytes():
+            if _INITIALIZED_TABLE[status]:
+                yield self.get_entry(index)
 
     @property
     def onboot(self) -> MMBOnbootList:
         """MMBOnbootList: List of images inserted into drives at boot time."""
-        return MMBOnbootList(self)
+        return self._onboot
 
     def open_entry(self, entry: Union[int, MMBEntry], open_mode: OpenMode = None,
                    warn_mode: WarnMode = None,
@@ -317,6 +387,8 @@ class MMBFile:
         """
         if not isinstance(entry, MMBEntry):
             entry = self.get_entry(entry)
+        # Imported here, so that reading MMB catalog doesn't require image modules
+        from .image import Image  # pylint: disable=import-outside-toplevel
         return Image.open(self.filename, for_write=not self.is_read_only and not catalog_only,
                           open_mode=open_mode, warn_mode=warn_mode, index=entry,
                           catalog_only=catalog_only)
@@ -332,12 +404,55 @@ class MMBFile:
         """
         count = 0
         for entry in self.entries:
+            # Open and validate image only if its title differs from the catalog
+            if entry.title == self._read_image_title(entry.index):
+                continue
             with entry.open(warn_mode=warn_mode, catalog_only=True) as image:
                 if entry.title != image.title:
                     entry.title = image.title
                     count += 1
         return count
 
+    def _read_image_title(self, index: int) -> str:
+        """Read disk title directly from catalog sectors of an image."""
+        file = cast(IO[bytes], self.file)
+        file.seek(MMB_INDEX_SIZE + index * MMB_DISK_SIZE, SEEK_SET)
+        data = file.read(SECTOR_SIZE + 4)
+        if len(data) != SECTOR_SIZE + 4:
+            raise RuntimeError("%s: unexpected image short read" % self.filename)
+        vbytes = bytes(x & 127 for x in data[0:8] + data[SECTOR_SIZE:SECTOR_SIZE + 4])
+        return bbc_to_unicode(vbytes.decode("ascii").rstrip(chr(0)))
+
+    def _entries_in_range(self, start_index: Optional[int],
+                          end_index: Optional[int]) -> Generator[MMBEntry, None, None]:
+        """Generate entries in range of indexes.
+
+        Uninitialized entries are included only if the range selects single image.
+        """
+        self._not_closed()
+        single = (start_index is not None and end_index is not None
+                  and end_index == start_index + 1)
+        start = 0 if start_index is None else max(start_index, 0)
+        end = self.count if end_index is None else min(end_index, self.count)
+        statuses = self._statuses
+        for index in range(start, end):
+            if single or _INITIALIZED_TABLE[statuses[index]]:
+                yield self.get_entry(index)
+
+    def _compile_pattern(self, pattern: Optional[PatternUnion],
+                         entries: List[MMBEntry]) -> Optional[PatternList]:
+        """Compile pattern once for all listed images.
+
+        All images in **MMB** file are single sided, so pattern is compiled using first
+        of the images. Returns `None` if there are no images.
+        """
+        if pattern is None or isinstance(pattern, PatternList):
+            return pattern
+        if not entries:
+            return None
+        with entries[0].open(warn_mode=WarnMode.NONE, catalog_only=True) as image:
+            return image._compile_pattern(pattern)  # pylint: disable=protected-access
+
     #: **MMB** file properties returned by :meth:`get_properties` method.
     #:
     #: :meta hide-value:
@@ -350,7 +465,12 @@ class MMBFile:
     @property
     def image_count(self) -> int:
         """int: Number of initialized images in the **MMB** file."""
-        return sum(True for entry in self.entries)
+        self._not_closed()
+        return bytes(self._statuses).translate(_INITIALIZED_TABLE).count(1)
+
+    def _iter_status_bytes(self) -> Iterator[Tuple[int, int]]:
+        """Iterate over pairs of image index and current catalog status byte."""
+        return enumerate(self._statuses)
 
     def get_properties(self, for_format: bool, recurse: bool,  # pylint: disable=unused-argument
                        level: int = 0,
@@ -385,18 +505,10 @@ class MMBFile:
 
         if recurse or level < 0:
             image_list = []
-            parsed = None
-            for entry in self.all_entries:
-                if start_index is not None and entry.index < start_index:
-                    continue
-                if end_index is not None and entry.index >= end_index:
-                    continue
-                if not entry.initialized and (start_index is None or end_index is None
-                                              or end_index != start_index + 1):
-                    continue
+            entries = list(self._entries_in_range(start_index, end_index))
+            parsed = self._compile_pattern(pattern, entries)
+            for entry in entries:
                 with entry.open(warn_mode=WarnMode.NONE, catalog_only=False) as image:
-                    if parsed is None:
-                        parsed = image.compile_pattern(pattern)
                     image_list.append(
                         image.get_side(0).get_properties(
                             for_format=False, recurse=recurse, level=level+1,
@@ -435,31 +547,20 @@ class MMBFile:
             kwargs: Remaining arguments are passed to the :meth:`Image.listing`
                 method.
         """
-        count = 0
-        line = ""
-        parsed = None
-        for entry in self.all_entries:
-            if start_index is not None and entry.index < start_index:
-                continue
-            if end_index is not None and entry.index >= end_index:
-                continue
-            if not entry.initialized and (start_index is None or end_index is None
-                                          or end_index != start_index + 1):
-                continue
+        line_parts: List[str] = []
+        entries = list(self._entries_in_range(start_index, end_index))
+        parsed = self._compile_pattern(pattern, entries)
+        for entry in entries:
             with entry.open(warn_mode=WarnMode.NONE, catalog_only=True) as image:
-                if pattern is not None and parsed is None:
-                    parsed = image.compile_pattern(pattern)
                 if fmt == ListFormat.DCAT:
-                    line += image.sides[0].dcat_line()
-                    count += 1
-                    if count == 4:
-                        print(line)
-                        line = ""
-                        count = 0
+                    line_parts.append(image.sides[0].dcat_line())
+                    if len(line_parts) == 4:
+                        print("".join(line_parts))
+                        line_parts.clear()
                 else:
                     image.listing(fmt=fmt, pattern=parsed, silent=True, **kwargs)
-        if count != 0:
-            print(line)
+        if line_parts:
+            print("".join(line_parts))
         if not silent and parsed is not None:
             parsed.ensure_matched()
 
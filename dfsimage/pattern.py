@@ -1,5 +1,7 @@
 """This module contains parsed DFS file name pattern and pattern list."""
 
+import re
+
 from re import Pattern
 from typing import Union, Optional, List
 
@@ -19,6 +21,9 @@ class ParsedPattern:
         """
         self.filename = filename
         self.dirname = dirname
+        # Bound match methods, used when matching every file against pattern
+        self.match_filename = filename.match
+        self.match_dirname = dirname.match if dirname is not None else None
         self.head = head
         self.pattern = pattern
         self.match_count = 0
@@ -35,6 +40,12 @@ class PatternList:
     def __init__(self, patterns: List[ParsedPattern]):
         """Construct PatternList by wrapping list of ParsedPattern objects."""
         self.patterns = patterns
+        # Combined filename regex, used to quickly reject files not matching any pattern
+        self.match_any_filename = None
+        filenames = [pattern.filename for pattern in patterns]
+        if filenames and None not in filenames and len(set(f.flags for f in filenames)) == 1:
+            self.match_any_filename = re.compile(
+                "|".join("(?:%s)" % f.pattern for f in filenames), filenames[0].flags).match
 
     def ensure_matched(self):
         """Raise exception if any of patterns didn't match any file."""
@@ -74,6 +74,10 @@ class ImageProtocol(Protocol):
 
     def _logical_sector(self, head: int, sector: int) -> memoryview: ...
 
+    def _logical_sector_start(self, head: int, logical_sector: int) -> int: ...
+
+    def _catalog_sectors(self, head: int) -> Tuple[memoryview, memoryview, int]: ...
+
     def _track(self, head: int, track: int) -> memoryview: ...
 
     def get_sectors(self, head: int, start_track: int, start_sector: int,
@@ -132,7 +136,8 @@ class SideProtocol(Protocol):
 
     def get_all_sectors(self) -> Sectors: ...
 
-    def _check_sectors_allocation(self, warnall: bool = False) -> bool: ...
+    def _check_sectors_allocation(self, warnall: bool = False,
+                                  fmt: Optional[Callable] = None) -> bool: ...
 
     def _check_valid(self) -> None: ...
 
@@ -1,6 +1,5 @@
 """This module provides 'Sectors' class."""
 import itertools
-import hashlib
 import sys
 
 from typing import Any, Iterator, List, IO
@@ -10,7 +9,7 @@ from typing import cast
 from itertools import islice
 
 from .conv import bbc_to_unicode
-from .misc import bchr
+from .misc import bchr, new_hash
 
 
 class SectorsOwnerProtocol(Protocol):
@@ -90,7 +89,7 @@ class Sectors:
         """
         self.image.modified = True
         for chunk in self.chunks:
-            chunk[:] = bchr(value) * len(chunk)  # type: ignore
+            chunk[:] = bchr[value] * len(chunk)  # type: ignore
 
     def clear(self) -> None:
         """Clear all sectors by filling it with zeros."""
@@ -247,8 +246,18 @@ class Sectors:
         """
         if algorithm is None:
             algorithm = 'sha1'
-        return hashlib.new(algorithm, self.readall(),
-                           usedforsecurity=False).hexdigest()  # type: ignore[call-arg]
+        digest = new_hash(algorithm)
+        self._update_digest(digest)
+        return digest.hexdigest()
+
+    def _update_digest(self, digest) -> None:
+        """Feed used sectors' data into hash object straight from the memory chunks."""
+        remaining = self.used_size
+        for chunk in self.chunks:
+            if remaining <= 0:
+                break
+            digest.update(chunk[:remaining])
+            remaining -= len(chunk)
 
     @staticmethod
     def decode_hexdump(data: str) -> bytes:
@@ -1,10 +1,13 @@
 """This module provides class 'Side' which represents one side of floppy image."""
 
+import io
 import sys
-import hashlib
+import operator
+import string
+import struct
 
-from typing import Optional, Generator, Sequence, Union, List
-from typing import Dict, Iterable, IO, NamedTuple
+from typing import Optional, Iterator, Sequence, Union, List
+from typing import Dict, Iterable, IO, NamedTuple, Tuple, Callable
 from typing import cast
 
 from . import simplewarn
@@ -16,12 +19,12 @@ from .consts import SECTORS, MAX_FILES, SINGLE_SECTORS, DOUBLE_SECTORS
 
 from .enums import DigestMode, ListFormat, WarnMode
 from .enums import ListFormatUnion
-from .misc import bchr, json_dumps, xml_dumps
-from .misc import LazyString, ValidationWarning
-from .conv import bbc_to_unicode, unicode_to_bbc, from_bcd, to_bcd
+from .misc import bchr, json_dump, xml_dump
+from .misc import LazyString, ValidationWarning, new_hash
+from .conv import bbc_to_unicode, unicode_to_bbc, to_bcd
 
 from .sectors import Sectors
-from .pattern import PatternUnion
+from .pattern import ParsedPattern, PatternList, PatternUnion
 from .entry import Entry
 from .protocol import ImageProtocol, Property
 
@@ -29,10 +32,57 @@ from .protocol import ImageProtocol, Property
 FoundFreeBlock = NamedTuple('FoundFreeBlock', [('sector_number', int),
                                                ('catalog_index', int)])
 
+_CatalogHeader = NamedTuple('_CatalogHeader', [('title', str),
+                                               ('sequence_number', int),
+                                               ('last_entry_offset', int),
+                                               ('opt_byte', int),
+                                               ('number_of_sectors', int)])
+
+# Maximum number of compiled patterns remembered by each side
+_PATTERN_CACHE_MAX = 32
+
+_Occupancy = NamedTuple('_Occupancy', [('used_sectors', int),
+                                       ('largest_free_sectors', int)])
+
+# Translation table clearing the top bit of each byte
+_STRIP_HIGH = bytes(x & 127 for x in range(256))
+
+# Sequence number, last entry offset, options byte and number of sectors
+# at offset 4 of the second catalog sector
+_CATALOG_HEADER = struct.Struct('4B')
+
+# Length, high bits and start sector of each entry in the second catalog sector
+_ENTRY_EXTENTS = struct.Struct('<4xHBB')
+
+# Translation table clearing the top bit and folding ASCII letters to lower case
+_LOWER_LUT = bytes(x & 127 | 32 if 65 <= x & 127 <= 90 else x & 127 for x in range(256))
+
+# Characters valid in file and directory names
+_NAME_CHARS = bytes(range(32, 127))
+
+# Contents of a cleared sector
+_EMPTY_SECTOR = bytes(SECTOR_SIZE)
+
+# Sort key grouping capital and lower letters of file names together,
+# equivalent to Entry.__lt__
+_SORT_KEY = operator.attrgetter('sorting_string')
+
+# Boot option names as displayed by DFS, indexed by boot option value
+_BOOT_OPT_NAMES = ("off", "LOAD", "RUN", "EXEC")
+
+# Boot option values by lower case name
+_BOOT_OPT_MAP = {name.lower(): value for value, name in enumerate(_BOOT_OPT_NAMES)}
+
 
 class Side:
     """Represents one side of a floppy image."""
 
+    __slots__ = ('image', 'head', 'total_sectors', 'isvalid',
+                 '_csector1', '_csector2', '_cdata', '_cs1_base', '_cs2_base',
+                 '_entries', '_header_cache', '_header_seq', '_pattern_cache',
+                 '_name_index', '_name_index_key', '_extents_cache', '_extents_key',
+                 '_digest_cache', '_digest_seq')
+
     TABLE_FORMAT = (
         "{displayname:15}|{number_of_files:2}|"
         "{title:12}|{opt_str:4}|"
@@ -40,6 +90,9 @@ class Side:
         "{max_free_blk:6}|{sha1_files}"
         )
 
+    # TABLE_FORMAT split into (literal, field, spec, conversion) segments
+    _TABLE_SEGMENTS = tuple(string.Formatter().parse(TABLE_FORMAT))
+
     def __init__(self, image: ImageProtocol, head: int) -> None:
         """Construct 'Side' object representing single floppy side in a disk image.
 
@@ -53,8 +106,31 @@ class Side:
         self.head = head % image.heads
         #: int: Number of sectors
         self.total_sectors = self.image.sectors_per_head
-        self._csector1 = self._logical_sector(CATALOG_SECTOR1)
-        self._csector2 = self._logical_sector(CATALOG_SECTOR2)
+        # Catalog views are cast to unsigned bytes once, so that entry views
+        # sliced from them always index as plain integers
+        # pylint: disable=protected-access
+        self._csector1, self._csector2, self._cs1_base = self.image._catalog_sectors(self.head)
+        # Underlying image buffer and offsets of the catalog sectors,
+        # for scalar reads that bypass memoryview indexing
+        self._cdata = cast(bytearray, self._csector2.obj)
+        self._cs2_base = self._cs1_base + SECTOR_SIZE
+        # Entry objects per catalog slot. An entry refers to its slot rather
+        # than to a file, so cached objects remain valid when files are moved
+        # between slots.
+        self._entries: List[Optional[Entry]] = [None] * MAX_FILES
+        self._header_cache: Optional[_CatalogHeader] = None
+        self._header_seq: Optional[int] = None
+        self._pattern_cache: Dict[Union[str, Tuple[str, ...]], PatternList] = {}
+        # Catalog entry indexes by name, with modification sequence number
+        # and number of files they were built for
+        self._name_index: Optional[Dict[bytes, int]] = None
+        self._name_index_key: Tuple[int, int] = (-1, -1)
+        # Start and end sectors of files, keyed the same way as the name index
+        self._extents_cache: Optional[Tuple[Tuple[int, int], ...]] = None
+        self._extents_key: Tuple[int, int] = (-1, -1)
+        # Digests computed since the last image modification
+        self._digest_cache: Dict[Tuple[DigestMode, str], str] = {}
+        self._digest_seq: Optional[int] = None
         self.isvalid = True
 
     @property
@@ -146,6 +222,25 @@ class Side:
         """
         return self.head * 2
 
+    @property
+    def _header(self) -> _CatalogHeader:
+        """Catalog header fields decoded once per image modification."""
+        header = self._header_cache
+        if header is None or self._header_seq != self.image.mod_seq:
+            vbytes = bytearray(12)
+            vbytes[0:8] = self._csector1[0:8]
+            vbytes[8:12] = self._csector2[0:4]
+            title = bbc_to_unicode(vbytes.translate(_STRIP_HIGH).rstrip(b'\x00').decode("ascii"))
+            sequence, last_entry_offset, opt_byte, sectors_low = _CATALOG_HEADER.unpack_from(
+                self._cdata, self._cs2_base + 4)
+            # Sequence number is BCD encoded
+            header = _CatalogHeader(title, (sequence >> 4) * 10 + (sequence & 15),
+                                    last_entry_offset, opt_byte,
+                                    sectors_low + ((opt_byte & 3) << 8))
+            self._header_cache = header
+            self._header_seq = self.image.mod_seq
+        return header
+
     @property
     def title(self) -> str:
         """str: Floppy title.
@@ -155,14 +250,13 @@ class Side:
         Raises:
             ValueError: Assigned title is longer than 12 chars
         """
-        vbytes = bytes((x & 127 for x in bytes(self._csector1[0:8])+bytes(self._csector2[0:4])))
-        return bbc_to_unicode(vbytes.decode("ascii").rstrip(chr(0)))
+        return self._header.title
 
     @title.setter
     def title(self, value: str) -> None:
         if len(value) > 12:
             raise ValueError("title too long")
-        vbytes = unicode_to_bbc(value).ljust(12, chr(0)).encode("ascii")
+        vbytes = unicode_to_bbc(value).encode("ascii").ljust(12, b"\0")
         self.modified = True
         self._csector1[0:8] = vbytes[0:8]  # type: ignore
         self._csector2[0:4] = vbytes[8:12]  # type: ignore
@@ -176,7 +270,7 @@ class Side:
         Sequence number is a Binary Coded Decimal value incremented by the Disk Filing System
         each time the disk catalog is modified.
         """
-        return from_bcd(self._csector2[4])
+        return self._header.sequence_number
 
     @sequence_number.setter
     def sequence_number(self, value: int) -> None:
@@ -194,7 +288,7 @@ class Side:
         Raises:
             ValueError: Assigned value is outside of valid range of is not a multiple of 8.
         """
-        return self._csector2[5]
+        return self._header.last_entry_offset
 
     @last_entry_offset.setter
     def last_entry_offset(self, value: int) -> None:
@@ -233,7 +327,7 @@ class Side:
         The options byte contains Boot option flag and highest bits of 'Number of sectors' value.
         If bits 2,3,6 or 7 are not all zero, floppy image is considered invalid or unsupported.
         """
-        return self._csector2[6]
+        return self._header.opt_byte
 
     @opt_byte.setter
     def opt_byte(self, value: int) -> None:
@@ -281,7 +375,7 @@ class Side:
 
         This value should be either 800 for 80 track disks, or 400 for 40 track disks.
         """
-        return self._csector2[7] + ((self._csector2[6] & 3) << 8)
+        return self._header.number_of_sectors
 
     @number_of_sectors.setter
     def number_of_sectors(self, value: int) -> None:
@@ -291,15 +385,22 @@ class Side:
         self._csector2[7] = value & 255  # type: ignore
         self._csector2[6] = (self._csector2[6] & ~3) | ((value >> 8) & 3)  # type: ignore
 
+    def _compute_occupancy(self) -> _Occupancy:
+        """Count used sectors and find largest free block in one pass over catalog."""
+        if not self.isvalid:
+            return _Occupancy(self.number_of_sectors, 0)
+        extents = self._file_extents()
+        starts = tuple(start for start, _ in extents)
+        ends = tuple(end for _, end in extents)
+        used = CATALOG_SECTORS + sum(ends) - sum(starts)
+        # Gaps above each file, followed by the gap above the catalog
+        gaps = map(operator.sub, (self.number_of_sectors,) + starts, ends + (CATALOG_SECTORS,))
+        return _Occupancy(used, max(0, max(gaps)))
+
     @property
     def used_sectors(self) -> int:
         """int: Number of sectors occupied by files and catalog."""
-        if not self.isvalid:
-            return self.number_of_sectors
-        result = CATALOG_SECTORS
-        for file in self.files:
-            result += file.sectors_count
-        return result
+        return self._compute_occupancy().used_sectors
 
     @property
     def free_sectors(self) -> int:
@@ -321,23 +422,16 @@ class Side:
         """
         if not self.image.isvalid:
             return self.total_sectors
-        if self.number_of_files == 0:
+        extents = self._file_extents()
+        if not extents:
             return CATALOG_SECTORS
         # If image is valid then first file is the located last on floppy
-        return self.get_entry(0).end_sector
+        return extents[0][1]
 
     @property
     def largest_free_block(self) -> int:
         """int: Size of largest continuous free block."""
-        if not self.isvalid:
-            return 0
-        largest = 0
-        end = self.number_of_sectors
-        for file in self.files:
-            largest = max(largest, end - file.end_sector)
-            end = file.start_sector
-        largest = max(largest, end - CATALOG_SECTORS)
-        return largest * SECTOR_SIZE
+        return self._compute_occupancy().largest_free_sectors * SECTOR_SIZE
 
     def _find_free_block(self, min_size: int) -> Optional[FoundFreeBlock]:
         """Find first free block of required size.
@@ -349,34 +443,58 @@ class Side:
             index for catalog entry insertion.
         """
         sectors = (min_size + SECTOR_SIZE - 1) // SECTOR_SIZE
-        start = CATALOG_SECTORS
-        index = self.number_of_files - 1
-        while index >= 0:
-            file = self.get_entry(index)
-            gap = file.start_sector - start
-            if gap < 0:
-                raise RuntimeError("bad file order in disk catalog")
-            if gap >= sectors:
-                return FoundFreeBlock(start, file.index + 1)
-            start = file.end_sector
-            index -= 1
-        gap = self.number_of_sectors - start
-        if gap < 0:
+        extents = self._file_extents()
+        # Gaps from the catalog upwards: below each file in reverse catalog
+        # order, followed by the gap above the last file on disk
+        starts = tuple(start for start, _ in reversed(extents)) + (self.number_of_sectors,)
+        ends = (CATALOG_SECTORS,) + tuple(end for _, end in reversed(extents))
+        gaps = tuple(map(operator.sub, starts, ends))
+        found = next((pos for pos, gap in enumerate(gaps) if gap < 0 or gap >= sectors), None)
+        if found is None:
+            return None
+        if gaps[found] < 0:
             raise RuntimeError("bad file order in disk catalog")
-        if gap >= sectors:
-            return FoundFreeBlock(start, 0)
-        return None
+        return FoundFreeBlock(ends[found], len(extents) - found)
+
+    def _file_extents(self) -> Tuple[Tuple[int, int], ...]:
+        """Get start and end sector of each file in catalog order.
+
+        The table is decoded once per image modification.
+        """
+        seq = self.image.mod_seq
+        nfiles = self.number_of_files
+        if self._extents_cache is None or self._extents_key != (seq, nfiles):
+            extents = []
+            base = self._cs2_base + 8
+            for size, high_bits, start_low in _ENTRY_EXTENTS.iter_unpack(
+                    self._cdata[base:base + nfiles * 8]):
+                start_sector = start_low | ((high_bits & 3) << 8)
+                size |= (high_bits & 0x30) << 12
+                extents.append((start_sector,
+                                start_sector + (size + SECTOR_SIZE - 1) // SECTOR_SIZE))
+            self._extents_cache = tuple(extents)
+            self._extents_key = (seq, nfiles)
+        return self._extents_cache
+
+    def _shift_entries(self, start: int, end: int, delta: int) -> None:
+        """Move catalog bytes in range start - end by delta bytes in both catalog sectors.
+
+        Slice assignment on the image buffer is a single overlapping-safe
+        memory move, and an empty range is a no-op.
+        """
+        cdata = self._cdata
+        for base in (self._cs1_base, self._cs2_base):
+            cdata[base+start+delta:base+end+delta] = cdata[base+start:base+end]
 
     def _remove_entry(self, index: int) -> None:
         end = self.last_entry_offset + 8
         start = (index + 2) * 8
+        nfiles = self.number_of_files
 
         self.modified = True
-        if start != end:
-            self._csector1[start-8:end-8] = self._csector1[start:end]
-            self._csector2[start-8:end-8] = self._csector2[start:end]
+        self._shift_entries(start, end, -8)
 
-        self[self.number_of_files-1]._clear()
+        self.get_entry(nfiles-1)._clear()
         self.last_entry_offset = end - 16
 
     def _insert_entry(self, index: int, fullname: str,
@@ -386,32 +504,34 @@ class Side:
         sectors = (size + SECTOR_SIZE - 1) // SECTOR_SIZE
 
         if index < self.number_of_files:
-            if start_sector < self[index].end_sector:
+            prev_end = self.get_entry(index).end_sector
+            if start_sector < prev_end:
                 raise ValueError("sector overlaps previous file (%d < %d)"
-                                 % (start_sector, self[index].end_sector))
+                                 % (start_sector, prev_end))
         if start_sector < 2:
             raise ValueError("sector overlaps catalog (%d < 2)"
                              % start_sector)
 
+        end_sector = start_sector + sectors
         if index > 0:
-            if start_sector + sectors > self[index-1].start_sector:
+            next_start = self.get_entry(index-1).start_sector
+            if end_sector > next_start:
                 raise ValueError("sector overlaps next file (%d > %d)"
-                                 % (start_sector + sectors, self[index-1].start_sector))
-        if start_sector + sectors > self.number_of_sectors:
+                                 % (end_sector, next_start))
+        number_of_sectors = self.number_of_sectors
+        if end_sector > number_of_sectors:
             raise ValueError("sector overflows disk (%d > %d)"
-                             % (start_sector + sectors, self.number_of_sectors))
+                             % (end_sector, number_of_sectors))
 
         if end + 8 > SECTOR_SIZE:
             raise ValueError("catalog sector overflow (%d)" % (end + 8))
 
         self.modified = True
-        if start != end:
-            self._csector1[start+8:end+8] = self._csector1[start:end]
-            self._csector2[start+8:end+8] = self._csector2[start:end]
+        self._shift_entries(start, end, 8)
 
         self.last_entry_offset = end
 
-        entry = self[index]
+        entry = self.get_entry(index)
         entry._clear()
         entry.fullname = fullname
         entry.start_sector = start_sector
@@ -433,10 +553,11 @@ class Side:
 
         if self.number_of_files == MAX_FILES:
             raise RuntimeError("catalog full")
-        if size > self.free_sectors * SECTOR_SIZE:
+        occupancy = self._compute_occupancy()
+        if size > (self.number_of_sectors - occupancy.used_sectors) * SECTOR_SIZE:
             raise RuntimeError("no space for file in floppy image")
 
-        if size > self.largest_free_block and not no_compact:
+        if size > occupancy.largest_free_sectors * SECTOR_SIZE and not no_compact:
             self.compact()
         found = self._find_free_block(size)
         if found is None:
@@ -468,9 +589,11 @@ class Side:
         """
         if not self.isvalid or self.number_of_files == MAX_FILES:
             return False
-        if self.largest_free_block >= size:
+        occupancy = self._compute_occupancy()
+        if occupancy.largest_free_sectors * SECTOR_SIZE >= size:
             return True
-        if not no_compact and self.free_sectors * SECTOR_SIZE >= size:
+        if (not no_compact
+                and (self.number_of_sectors - occupancy.used_sectors) * SECTOR_SIZE >= size):
             return True
         return False
 
@@ -498,16 +621,25 @@ class Side:
         Raises:
             ValueError: File name is invalid.
         """
-        i = 0
-        name = unicode_to_bbc(self._to_fullname(filename))
-        while i < self.number_of_files:
-            start = (i+1) * 8
-            end = (i+2) * 8
-            entry = Entry(self, i, self._csector1[start:end], self._csector2[start:end])
-            if entry.fullname_ascii.lower() == name.lower():
-                return entry
-            i += 1
-        return None
+        name = unicode_to_bbc(self._to_fullname(filename)).lower()
+        # Catalog entry layout: file name padded with spaces, then directory
+        key = (name[2:].ljust(7) + name[0]).encode("ascii")
+        index = self._get_name_index().get(key)
+        if index is None:
+            return None
+        return self.get_entry(index)
+
+    def _get_name_index(self) -> Dict[bytes, int]:
+        """Get catalog entry indexes by lower case raw name, rebuilt after modification."""
+        nfiles = self.number_of_files
+        seq = self.image.mod_seq
+        if self._name_index is None or self._name_index_key != (seq, nfiles):
+            names = bytes(self._csector1[8:8 + nfiles * 8]).translate(_LOWER_LUT)
+            # Walk backwards, so that the first of duplicate names wins
+            self._name_index = {names[offset:offset+8]: offset // 8
+                                for offset in range(nfiles * 8 - 8, -8, -8)}
+            self._name_index_key = (seq, nfiles)
+        return self._name_index
 
     def compact(self) -> None:
         """Compact fragmented free space on disk.
@@ -518,15 +650,27 @@ class Side:
         self._check_valid()
         start_sector = 2
         last_used_sector = self.last_used_sector
-        entries = list(self.files)
-        entries.reverse()
-        for entry in entries:
-            if entry.start_sector != start_sector:
-                data = self.get_logical_sectors(entry.start_sector, entry.end_sector)
-                end_sector = start_sector + entry.sectors_count
-                self.get_logical_sectors(start_sector, end_sector).writeall(data)
-                entry.start_sector = start_sector
-            start_sector += entry.sectors_count
+        extents = self._file_extents()
+        # List of [source start, source end, destination start] sector ranges. Files
+        # adjacent on disk are moved together.
+        moves: List[List[int]] = []
+        # Catalog is sorted by descending start sector - walk it backwards
+        for index in range(len(extents) - 1, -1, -1):
+            entry_start, entry_end = extents[index]
+            if entry_start != start_sector:
+                if moves and moves[-1][1] == entry_start:
+                    moves[-1][1] = entry_end
+                else:
+                    moves.append([entry_start, entry_end, start_sector])
+                self.get_entry(index).start_sector = start_sector
+            start_sector += entry_end - entry_start
+        if moves:
+            # Once a file has moved, every file after it moves too, so destination
+            # ranges are contiguous. Snapshot all moved sectors and write them at once.
+            data = b''.join(chunk for source_start, source_end, _ in moves
+                            for chunk in self.get_logical_sectors(source_start,
+                                                                  source_end).chunks)
+            self.get_logical_sectors(moves[0][2], start_sector).writeall(data)
         if start_sector != last_used_sector:
             self.get_logical_sectors(start_sector, last_used_sector).clear()
 
@@ -545,9 +689,13 @@ class Side:
         if isinstance(index, int):
             if index < 0 or index > 30:
                 raise IndexError("invalid file entry index")
-            start = (index+1) * 8
-            end = (index+2) * 8
-            return Entry(self, index, self._csector1[start:end], self._csector2[start:end])
+            entry = self._entries[index]
+            if entry is None:
+                start = (index+1) * 8
+                entry = Entry(self, index, self._csector1[start:start+8],
+                              self._csector2[start:start+8])
+                self._entries[index] = entry
+            return entry
 
         if isinstance(index, str):
             entry = self.find_entry(index)
@@ -557,13 +705,18 @@ class Side:
 
         raise TypeError("index must be str or int, not %s" % type(index).__name__)
 
+    def _file_list(self) -> List[Entry]:
+        """Get list of file entries from the slot cache, filling in missing slots."""
+        files = self._entries[:self.number_of_files]
+        for index, entry in enumerate(files):
+            if entry is None:
+                files[index] = self.get_entry(index)
+        return cast(List[Entry], files)
+
     @property
-    def files(self) -> Generator[Entry, None, None]:
-        """Generator[:class:`Entry`, None, None]: Sequence of file entries."""
-        index = 0
-        while index < self.number_of_files:
-            yield self.get_entry(index)
-            index += 1
+    def files(self) -> Iterator[Entry]:
+        """Iterator[:class:`Entry`]: Sequence of file entries."""
+        return iter(self._file_list())
 
     def get_files(self, pattern: PatternUnion = None,
                   silent: bool = False) -> List[Entry]:
@@ -578,17 +731,34 @@ class Side:
             FileNotFoundError: No file found matching `pattern`.
         """
         if pattern is None:
-            return list(self.files)
+            return self._file_list()
 
-        parsed = self.image._compile_pattern(pattern)
-        files = [file for file in iter(self.files)
+        parsed = self._compile_pattern(pattern)
+        files = [file for file in self._file_list()
                  if file._match_parsed(parsed, self.head)]
         if not silent:
             parsed.ensure_matched()
         return files
 
-    def __iter__(self) -> Generator[Entry, None, None]:
-        return self.files
+    def _compile_pattern(self, pattern: PatternUnion) -> PatternList:
+        """Compile pattern, reusing result of earlier call with the same string patterns."""
+        if isinstance(pattern, (ParsedPattern, PatternList)):
+            return self.image._compile_pattern(pattern)
+        key = pattern if isinstance(pattern, str) else tuple(pattern)
+        parsed = self._pattern_cache.get(key)
+        if parsed is None:
+            parsed = self.image._compile_pattern(pattern)
+            if len(self._pattern_cache) >= _PATTERN_CACHE_MAX:
+                self._pattern_cache.clear()
+            self._pattern_cache[key] = parsed
+        else:
+            # Each call reports unmatched patterns on its own
+            for pat in parsed.patterns:
+                pat.match_count = 0
+        return parsed
+
+    def __iter__(self) -> Iterator[Entry]:
+        return iter(self._file_list())
 
     def __getitem__(self, index: Union[int, str]) -> Entry:
         return self.get_entry(index)
@@ -628,48 +798,57 @@ class Side:
         if warn_mode == WarnMode.NONE:
             simplewarn.mute(ValidationWarning)
 
-        simplewarn.current_format = formatmsg
         try:
+            _, last_entry_offset, opt_byte, sectors_low = _CATALOG_HEADER.unpack_from(
+                self._cdata, self._cs2_base + 4)
+            number_of_sectors = sectors_low + ((opt_byte & 3) << 8)
 
             if ((isvalid or warnall)
-                    and self.number_of_sectors != DOUBLE_SECTORS
-                    and self.number_of_sectors != SINGLE_SECTORS):
+                    and number_of_sectors != DOUBLE_SECTORS
+                    and number_of_sectors != SINGLE_SECTORS):
                 isvalid = False
                 warn(ValidationWarning("Invalid total number of sectors (%d)"
-                                       % self.number_of_sectors))
-            if (isvalid or warnall) and self.number_of_sectors > self.total_sectors:
+                                       % number_of_sectors), formatmsg)
+            if (isvalid or warnall) and number_of_sectors > self.total_sectors:
                 isvalid = False
                 warn(ValidationWarning("Number of sectors in directory (%d) greater than "
                                        "the number of physical sectors (%d)"
-                                       % (self.number_of_sectors, self.total_sectors)))
-            if (isvalid or warnall) and self.last_entry_offset & 7 != 0:
+                                       % (number_of_sectors, self.total_sectors)), formatmsg)
+            if (isvalid or warnall) and last_entry_offset & 7 != 0:
                 isvalid = False
                 warn(ValidationWarning("Invalid end of catalog value (0x%02x)"
-                                       % self.last_entry_offset))
-            if (isvalid or warnall) and self.opt_byte & 0xcc != 0:
+                                       % last_entry_offset), formatmsg)
+            if (isvalid or warnall) and opt_byte & 0xcc != 0:
                 isvalid = False
                 warn(ValidationWarning("Invalid option byte or unsupported format (0x%02x)"
-                                       % self.opt_byte))
-            index = 0
-            end_sector = self.number_of_sectors
+                                       % opt_byte), formatmsg)
+            end_sector = number_of_sectors
             nfiles = self.number_of_files
             badorder = False
-            while (isvalid or warnall) and index < nfiles:
-                entry = self.get_entry(index)
-                isvalid &= entry.validate(warnall)
-                if (isvalid or warnall) and entry.end_sector > end_sector:
+            names = bytes(self._csector1[8:8 + nfiles * 8])
+            extents = _ENTRY_EXTENTS.iter_unpack(self._csector2[8:8 + nfiles * 8])
+            for index, (size, high_bits, start_low) in enumerate(extents):
+                if not (isvalid or warnall):
+                    break
+                offset = index * 8
+                start = start_low | ((high_bits & 3) << 8)
+                end = start + ((size | ((high_bits & 0x30) << 12)) + SECTOR_SIZE - 1) // SECTOR_SIZE
+                # Let the entry itself issue warnings only when something is wrong with it
+                if (names[offset:offset+7].translate(None, _NAME_CHARS)
+                        or not 32 <= names[offset+7] & 127 < 127
+                        or not CATALOG_SECTORS <= start <= end <= number_of_sectors):
+                    isvalid &= self.get_entry(index).validate(warnall, formatmsg)
+                if (isvalid or warnall) and end > end_sector:
                     # Files are either overlapping or at least not ordered properly
                     warn(ValidationWarning("Catalog entries are not ordered properly in entry #%s"
-                                           % index))
+                                           % index), formatmsg)
                     badorder = True
                     isvalid = False
-                end_sector = entry.start_sector
-                index += 1
+                end_sector = start
             if badorder:
-                self._check_sectors_allocation(warnall)
+                self._check_sectors_allocation(warnall, formatmsg)
 
         finally:
-            simplewarn.current_format = simplewarn.formatmsg
             simplewarn.unmute(ValidationWarning)
 
         return isvalid
@@ -752,90 +931,134 @@ class Side:
         Raise:
             ValueError: Pattern is invalid.
         """
+        image = self.image
+        is_mmb = image.is_mmb
+        attrs: Dict[str, object] = {}
         # pylint: disable=no-member
         if level >= 0:
-            pre_attrs: Dict = {}
             if level == 0:
-                pre_attrs['path'] = self.image.path
-                pre_attrs['filename'] = self.image.filename
+                attrs['path'] = image.path
+                attrs['filename'] = image.filename
                 if for_format:
-                    pre_attrs['basename'] = self.image.basename
-
-            if for_format or not self.image.is_mmb:
-                pre_attrs['side'] = self.head + 1
-            if for_format or self.image.is_mmb:
-                pre_attrs['index'] = self.image.index
-
-            attrs = {
-                **pre_attrs,
-                'title': self.title,
-                'sequence': self.sequence_number,
-                'opt_str': self.opt_str,
-                'is_valid': self.isvalid,
-                'number_of_files': self.number_of_files,
-                'sectors': self.number_of_sectors,
-                'free_sectors': self.free_sectors,
-                'max_free_blk_sectors': self.largest_free_block // SECTOR_SIZE,
-                'sha1': LazyString(cast(Property['Side', str], Side.sha1).fget, self),
-                'sha1_files': LazyString(cast(Property['Side', str], Side.sha1files).fget, self),
-                'sha1_used': LazyString(cast(Property['Side', str], Side.sha1used).fget, self)
-                }
-            if for_format or self.image.is_mmb:
-                mmb_stat = self.image._mmb_status_byte
-                attrs["locked"] = self.image.locked
-                attrs["initialized"] = self.image.initialized
+                    attrs['basename'] = image.basename
+
+            if for_format or not is_mmb:
+                attrs['side'] = self.head + 1
+            if for_format or is_mmb:
+                attrs['index'] = image.index
+
+            number_of_sectors = self.number_of_sectors
+            occupancy = self._compute_occupancy()
+            attrs['title'] = self.title
+            attrs['sequence'] = self.sequence_number
+            attrs['opt_str'] = self.opt_str
+            attrs['is_valid'] = self.isvalid
+            attrs['number_of_files'] = self.number_of_files
+            attrs['sectors'] = number_of_sectors
+            attrs['free_sectors'] = number_of_sectors - occupancy.used_sectors
+            attrs['max_free_blk_sectors'] = occupancy.largest_free_sectors
+            if for_format:
+                attrs['sha1'] = LazyString(_SHA1_FGET, self)
+                attrs['sha1_files'] = LazyString(_SHA1FILES_FGET, self)
+                attrs['sha1_used'] = LazyString(_SHA1USED_FGET, self)
+            else:
+                attrs['sha1'] = self.sha1
+                attrs['sha1_files'] = self.sha1files
+                attrs['sha1_used'] = self.sha1used
+            if for_format or is_mmb:
+                mmb_stat = image._mmb_status_byte
+                attrs["locked"] = image.locked
+                attrs["initialized"] = image.initialized
                 attrs["mmb_status_bytes"] = mmb_stat
-                attrs["mmb_status"] = self.image.MMB_STATUS_MAP.get(mmb_stat, 'I')
+                attrs["mmb_status"] = image.MMB_STATUS_MAP.get(mmb_stat, 'I')
         # pylint: enable=no-member
 
         if for_format and level >= 0:
             attrs['displayname'] = self.image_displayname
-            attrs['index_or_head'] = self.image.index if self.image.is_mmb else self.head
+            attrs['index_or_head'] = image.index if is_mmb else self.head
 
         if recurse or level < 0:
-            file_list = [file.get_properties(for_format=False, level=level+1)
-                         for file in self.get_files(pattern, silent)]
+            files = self.get_files(pattern, silent)
             if sort:
-                file_list.sort()
+                files.sort(key=_SORT_KEY)
+            file_list = [file._get_dump_properties(level + 1) for file in files]
 
             if level < 0:
                 return file_list
             attrs["files"] = file_list
 
         if not for_format:
-            attrs["sha1"] = str(attrs["sha1"])
-            attrs["sha1_files"] = str(attrs["sha1_files"])
-            attrs["sha1_used"] = str(attrs["sha1_used"])
             return attrs
 
-        redund_attrs = {
-            'tracks': self.number_of_sectors // SECTORS,
-            'drive': self.head * 2,  # First side is drive 0, second side is drive 2
-            'head': self.head,
-            'end_offset': self.last_entry_offset,  # = (files-1)*8
-            'opt_byte': self.opt_byte,
-            'opt': self.opt,  # 0, 1, 2 or 3
-            'used_sectors': self.used_sectors,
-            'free_bytes': self.free_bytes,
-            'max_free_blk': self.largest_free_block,
-            'last_used_sector': self.last_used_sector,
-            'current_dir': self.image.current_dir
-        }
-
-        return {**attrs, **redund_attrs}
+        # Redundant properties, only for custom listing format
+        attrs['tracks'] = number_of_sectors // SECTORS
+        attrs['drive'] = self.head * 2  # First side is drive 0, second side is drive 2
+        attrs['head'] = self.head
+        attrs['end_offset'] = self.last_entry_offset  # = (files-1)*8
+        opt_byte = self.opt_byte
+        attrs['opt_byte'] = opt_byte
+        attrs['opt'] = (opt_byte >> 4) & 3  # 0, 1, 2 or 3
+        attrs['used_sectors'] = occupancy.used_sectors
+        attrs['free_bytes'] = (number_of_sectors - occupancy.used_sectors) * SECTOR_SIZE
+        attrs['max_free_blk'] = occupancy.largest_free_sectors * SECTOR_SIZE
+        attrs['last_used_sector'] = self.last_used_sector
+        attrs['current_dir'] = image.current_dir
+        return attrs
 
     def dcat_line(self):
         """Generate index entry as displayed by ``*DCAT`` command.
 
         :meta private:
         """
-        index = self.image.index if self.image.is_mmb else self.head
-        if self.image.is_mmb:
-            mmb_stat = self.image._mmb_status_byte
-            status = self.image.MMB_STATUS_MAP.get(mmb_stat, 'I')
+        image = self.image
+        if image.is_mmb:
+            index = image.index
+            mmb_stat = image._mmb_status_byte
+            status = image.MMB_STATUS_MAP.get(mmb_stat, 'I')
         else:
+            index = self.head
             status = ''
-        return "%5d %12s %1s" % (index, self.title, status)
+        return f'{index:5d} {self.title:>12} {status:>1}'
+
+    @staticmethod
+    def _format_table_row(attrs: Dict[str, object]) -> str:
+        """Format properties with precompiled :data:`TABLE_FORMAT` segments."""
+        parts = []
+        for literal, field, spec, _ in Side._TABLE_SEGMENTS:
+            parts.append(literal)
+            if field is not None:
+                parts.append(format(attrs[field], spec))
+        return ''.join(parts)
+
+    def _table_header(self, file: IO) -> None:
+        """Print side properties as a table row."""
+        attrs = self.get_properties(for_format=True, recurse=False, level=0)
+        print(Side._format_table_row(cast(Dict[str, object], attrs)), file=file)
+
+    def _dcat_header(self, file: IO) -> None:
+        """Print index entry as displayed by ``*DCAT`` command."""
+        print(self.dcat_line(), file=file)
+
+    def _cat_header(self, file: IO) -> None:
+        """Print catalog header as displayed by ``*CAT`` command."""
+        drive = self.head * 2
+        optstr = Side.boot_opt_to_str(self.opt)
+        print(f'{self.title} ({self.sequence_number:02})', file=file)
+        print(f'{f"Drive {drive}":<20}Option {self.opt} ({optstr})', file=file)
+        print(f'{f"Dir. :{drive}.{self.image.current_dir}":<20}Lib. :0.$', file=file)
+        print("", file=file)
+
+    # Header printing methods by listing format, None for formats without header
+    _HEADER_DISPATCH: Dict[ListFormat, Optional[Callable[['Side', IO], None]]] = {
+        ListFormat.RAW: None,
+        ListFormat.INFO: None,
+        ListFormat.INF: None,
+        ListFormat.CAT: _cat_header,
+        ListFormat.JSON: None,
+        ListFormat.XML: None,
+        ListFormat.TABLE: _table_header,
+        ListFormat.DCAT: _dcat_header,
+    }
 
     def listing_header(self, fmt: ListFormatUnion = None,
                        file: IO = None) -> None:
@@ -859,44 +1082,38 @@ class Side:
             file = sys.stdout
         if fmt is None:
             fmt = ListFormat.CAT
-        if fmt == ListFormat.TABLE:
-            fmt = Side.TABLE_FORMAT
-        drive = self.head * 2
-        optstr = Side.boot_opt_to_str(self.opt)
-        if fmt == '':
-            pass
-        elif isinstance(fmt, str):
-            attrs = self.get_properties(for_format=True, recurse=False, level=0)
-            print(fmt.format_map(cast(Dict[str, object], attrs)), file=file)
-        elif fmt == ListFormat.DCAT:
-            print(self.dcat_line(), file=file)
-        elif fmt == ListFormat.CAT:
-            print(f'{self.title} ({self.sequence_number:02})', file=file)
-            print("%-20s%s" % (f'Drive {drive}', f'Option {self.opt} ({optstr})'), file=file)
-            print("%-20s%s" % (f'Dir. :{drive}.{self.image.current_dir}', 'Lib. :0.$'), file=file)
-            print("", file=file)
-        elif fmt not in (ListFormat.RAW, ListFormat.INFO, ListFormat.INF,
-                         ListFormat.JSON, ListFormat.XML):
-            raise ValueError("invalid listing format")
+        if isinstance(fmt, str):
+            if fmt != '':
+                attrs = self.get_properties(for_format=True, recurse=False, level=0)
+                print(fmt.format_map(cast(Dict[str, object], attrs)), file=file)
+            return
+        try:
+            handler = Side._HEADER_DISPATCH[fmt]
+        except (KeyError, TypeError):
+            raise ValueError("invalid listing format") from None
+        if handler is not None:
+            handler(self, file)
 
     @staticmethod
     def _print_cat_lines(entries: Iterable[Entry], file, gap):
         """Print catalog lines, two files per line."""
 
+        lines: List[str] = []
         fname1 = None
         for entry in entries:
-            if gap:
-                print('', file=file)
-                gap = False
             fname = entry.listing_entry(ListFormat.CAT)
             if fname1 is not None:
-                print('%-20s%s' % (fname1, fname), file=file)
+                lines.append(f'{fname1:<20}{fname}')
                 fname1 = None
             else:
                 fname1 = fname
         if fname1 is not None:
-            print(fname1, file=file)
-            fname1 = None
+            lines.append(fname1)
+        if lines:
+            if gap:
+                lines.insert(0, '')
+            lines.append('')
+            file.write('\n'.join(lines))
 
     def listing(self, fmt: ListFormatUnion = None,
                 pattern: PatternUnion = None,
@@ -943,6 +1160,17 @@ class Side:
         if file is None:
             file = sys.stdout
 
+        # Collect listing in memory and pass it to the output stream at once
+        buf = io.StringIO()
+        try:
+            self._listing(fmt, pattern, header_fmt, footer_fmt, sort, silent, buf)
+        finally:
+            file.write(buf.getvalue())
+
+    def _listing(self, fmt: ListFormatUnion, pattern: PatternUnion,
+                 header_fmt: ListFormatUnion, footer_fmt: ListFormatUnion,
+                 sort: Optional[bool], silent: bool, file: IO) -> None:
+        """Print catalog listing to output stream. See :meth:`Side.listing`."""
         fmt = ListFormat.CAT if fmt is None else fmt
 
         header_fmt = fmt if header_fmt is None and not isinstance(fmt, str) else header_fmt
@@ -954,7 +1182,7 @@ class Side:
 
         entries = self.get_files(pattern, silent)
         if sort:
-            entries.sort()
+            entries.sort(key=_SORT_KEY)
 
         if fmt == ListFormat.CAT:
             self._print_cat_lines((e for e in entries
@@ -967,17 +1195,19 @@ class Side:
         elif fmt == ListFormat.JSON:
             attrs = self.get_properties(for_format=False, recurse=True,
                                         level=0, pattern=pattern)
-            print(json_dumps(attrs), file=file, end='')
+            json_dump(attrs, file)
 
         elif fmt == ListFormat.XML:
             attrs = self.get_properties(for_format=False, recurse=True,
                                         level=0, pattern=pattern)
-            print(xml_dumps(attrs, "side"), file=file)
+            xml_dump(attrs, "side", file)
+            file.write('\n')
 
         elif (fmt in (ListFormat.RAW, ListFormat.INFO, ListFormat.INF, ListFormat.TABLE)
               or isinstance(fmt, str) and fmt != ''):
-            for entry in entries:
-                print(entry.listing_entry(fmt), file=file)
+            if entries:
+                file.write('\n'.join([entry.listing_entry(fmt) for entry in entries]))
+                file.write('\n')
 
         elif fmt != '' and fmt != ListFormat.DCAT:
             raise ValueError("invalid listing format")
@@ -1022,7 +1252,7 @@ class Side:
         """
         if (boot_opt < 0) or (boot_opt > 3):
             raise ValueError("invalid boot option value")
-        return ["off", "LOAD", "RUN", "EXEC"][boot_opt]
+        return _BOOT_OPT_NAMES[boot_opt]
 
     @staticmethod
     def str_to_boot_opt(opt_str: str) -> int:
@@ -1038,10 +1268,9 @@ class Side:
         Raise:
             ValueError: invalid boot option string
         """
-        try:
-            return ["off", "load", "run", "exec"].index(opt_str.lower())
-        except ValueError:
-            pass
+        val = _BOOT_OPT_MAP.get(opt_str.lower())
+        if val is not None:
+            return val
         try:
             val = int(opt_str)
             if 0 <= val <= 3:
@@ -1063,49 +1292,65 @@ class Side:
         """
         self.get_all_sectors().hexdump(start, size, width, ellipsis, file=file)
 
-    def _check_sectors_allocation(self, warnall: bool = False) -> bool:
+    def _check_sectors_allocation(self, warnall: bool = False,
+                                  fmt: Optional[Callable] = None) -> bool:
         """Check for overlapping sectors.
 
+        Args:
+            warnall: Report all problems, not just the first encountered.
+            fmt: Warning format function. See :func:`simplewarn.warn`.
         Returns:
             Validation result. False if files overlap.
         """
         def warn_if(cond: bool, warning):
             if cond:
-                warn(warning)
+                warn(warning, fmt)
 
         invalid = False
-        sectors_map = bytearray(bchr(0) * self.number_of_sectors)
+        sectors_map = bytearray(self.number_of_sectors)
         sectors_map[CATALOG_SECTOR1] = 254
         sectors_map[CATALOG_SECTOR2] = 254
         for file in self.files:
-            if file.end_sector > self.number_of_sectors or file.end_sector < 0:
+            start_sector = file.start_sector
+            end_sector = file.end_sector
+            if end_sector > self.number_of_sectors or end_sector < 0:
                 warn_if(not invalid or warnall,
                         ValidationWarning("File #%d sector number invalid" % (file.index + 1)))
                 invalid = True
                 continue
 
-            if file.start_sector > self.number_of_sectors or file.start_sector < 0:
+            if start_sector > self.number_of_sectors or start_sector < 0:
                 warn_if(not invalid or warnall,
                         ValidationWarning("File #%d sector number invalid" % (file.index + 1)))
                 invalid = True
                 continue
 
-            for logical_sector in range(file.start_sector, file.end_sector):
-                if sectors_map[logical_sector] == 254:
-                    warn_if(not invalid or warnall,
-                            ValidationWarning("File #%d overlaps catalog sectors"
-                                              % (file.index + 1)))
-                    invalid = True
-                    continue
+            # Mark unallocated range in one step, otherwise walk runs of
+            # sectors with the same owner to report overlaps
+            count = end_sector - start_sector
+            if sectors_map.count(0, start_sector, end_sector) == count:
+                sectors_map[start_sector:end_sector] = bchr[file.index + 1] * count
+                continue
 
-                if sectors_map[logical_sector] != 0:
-                    warn_if(not invalid or warnall,
-                            ValidationWarning("File #%d overlaps file #%d"
-                                              % (file.index + 1, sectors_map[logical_sector])))
+            logical_sector = start_sector
+            while logical_sector < end_sector:
+                owner = sectors_map[logical_sector]
+                region = sectors_map[logical_sector:end_sector]
+                run = len(region) - len(region.lstrip(bchr[owner]))
+                if owner == 0:
+                    sectors_map[logical_sector:logical_sector+run] = bchr[file.index + 1] * run
+                else:
+                    if owner == 254:
+                        warning = ValidationWarning("File #%d overlaps catalog sectors"
+                                                    % (file.index + 1))
+                    else:
+                        warning = ValidationWarning("File #%d overlaps file #%d"
+                                                    % (file.index + 1, owner))
+                    # One warning per overlapping sector, as long as warnings are due
+                    for _ in range(run if warnall else 1):
+                        warn_if(not invalid or warnall, warning)
                     invalid = True
-                    continue
-
-                sectors_map[logical_sector] = file.index + 1
+                logical_sector += run
 
         return not invalid
 
@@ -1120,10 +1365,10 @@ class Side:
         """
         if tracks is None:
             tracks = self.image.tracks
-        self.get_all_sectors().fill(0xe5)
-        empty = bytes(SECTOR_SIZE)
-        self._csector1[:] = empty  # type: ignore
-        self._csector2[:] = empty  # type: ignore
+        # Fill data sectors, catalog sectors are cleared below
+        self.get_logical_sectors(CATALOG_SECTORS, self.image.tracks * SECTORS).fill(0xe5)
+        self._csector1[:] = _EMPTY_SECTOR  # type: ignore
+        self._csector2[:] = _EMPTY_SECTOR  # type: ignore
         self.number_of_sectors = tracks * SECTORS
 
     def readall(self) -> bytes:
@@ -1138,28 +1383,25 @@ class Side:
         """
         self.get_all_sectors().writeall(data)
 
-    def _used_data(self) -> bytes:
-        """Read used floppy side areas in form suitable for digest."""
+    def _hash_used_data(self, digest) -> None:
+        """Feed used floppy side areas into hash object in form suitable for digest."""
         # Start with catalog sector length to make it provably unique.
         cend = self.last_entry_offset
-        parts = [b''.join((bchr(cend), self._csector1[:cend+8],
-                           self._csector2[:cend+8]))]
+        digest.update(bchr[cend])
+        digest.update(self._csector1[:cend+8])
+        digest.update(self._csector2[:cend+8])
         for file in self.files:
-            parts.append(file.readall())
-        return b''.join(parts)
+            file.get_sectors()._update_digest(digest)
 
-    def _files_data(self) -> bytes:
-        """Concatenate all files sorted alphabetically in form suitable for digest."""
-        parts = []
-        files = list(self.files)
-        files.sort()
+    def _hash_files_data(self, digest) -> None:
+        """Feed all files sorted alphabetically into hash object in form suitable for digest."""
+        files = sorted(self.files, key=_SORT_KEY)
         for file in files:
-            fullname = file.rawname
-            loadaddr = (file.load_address & 0x3ffff).to_bytes(3, 'little')
-            execaddr = (file.exec_address & 0x3ffff).to_bytes(3, 'little')
-            length = file.size.to_bytes(3, 'little')
-            parts.append(b''.join((fullname, loadaddr, execaddr, length, file.readall())))
-        return b''.join(parts)
+            digest.update(file.rawname)
+            digest.update((file.load_address & 0x3ffff).to_bytes(3, 'little'))
+            digest.update((file.exec_address & 0x3ffff).to_bytes(3, 'little'))
+            digest.update(file.size.to_bytes(3, 'little'))
+            file.get_sectors()._update_digest(digest)
 
     def get_digest(self, mode: DigestMode = None, algorithm: str = None) -> str:
         """Generate hexadecimal digest of floppy side contents.
@@ -1175,14 +1417,23 @@ class Side:
             algorithm = 'sha1'
         if mode is None:
             mode = DigestMode.ALL
+        if self._digest_seq != self.image.mod_seq:
+            self._digest_cache.clear()
+            self._digest_seq = self.image.mod_seq
+        key = (mode, algorithm)
+        hexdigest = self._digest_cache.get(key)
+        if hexdigest is not None:
+            return hexdigest
+        digest = new_hash(algorithm)
         if mode == DigestMode.ALL:
-            data = self.get_all_sectors().readall()
+            self.get_all_sectors()._update_digest(digest)
         elif mode == DigestMode.USED:
-            data = self._used_data()
+            self._hash_used_data(digest)
         else:
-            data = self._files_data()
-        return hashlib.new(algorithm, data,
-                           usedforsecurity=False).hexdigest()  # type: ignore[call-arg]
+            self._hash_files_data(digest)
+        hexdigest = digest.hexdigest()
+        self._digest_cache[key] = hexdigest
+        return hexdigest
 
     @property
     def sha1(self) -> str:
@@ -1198,3 +1449,11 @@ class Side:
     def sha1used(self) -> str:
         """str: SHA1 digest of floppy disk side surface excluding unused areas."""
         return self.get_digest(DigestMode.USED)
+
+
+# Digest property getters for lazy evaluation in Side.get_properties
+# pylint: disable=no-member
+_SHA1_FGET = cast(Property[Side, str], Side.sha1).fget
+_SHA1FILES_FGET = cast(Property[Side, str], Side.sha1files).fget
+_SHA1USED_FGET = cast(Property[Side, str], Side.sha1used).fget
+# pylint: enable=no-member
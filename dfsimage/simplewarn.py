@@ -2,11 +2,11 @@
 
 All warnings go to sys.stderr, no line numbers or stack frames.
 Warnings can be muted and unmuted globally by type.
-Format can be changed globally.
+Format can be changed globally or passed to a single call.
 """
 
 import sys
-from typing import Set, Type, IO, Callable
+from typing import Set, Type, IO, Callable, Optional
 
 muted: Set[Type] = set()
 stderr: IO = sys.stderr
@@ -20,12 +20,17 @@ def formatmsg(message) -> str:
 current_format: Callable = formatmsg
 
 
-def warn(message):
-    """Warnings just go out to stderr."""
+def warn(message, fmt: Optional[Callable] = None):
+    """Warnings just go out to stderr.
+
+    Args:
+        message: Warning object or message.
+        fmt: Format function to use instead of :data:`current_format`.
+    """
     for typ in muted:
         if isinstance(message, typ):
             return
-    print(current_format(message), file=stderr)
+    print((fmt or current_format)(message), file=stderr)
 
 
 def mute(typ: Type):
@@ -0,0 +1,20 @@
+# pylint: disable=missing-module-docstring, missing-function-docstring
+import pytest
+import dfsimage
+
+
+def test_inf_accepts_drive_name():
+    inf = dfsimage.Inf.from_string(":0.$.FILE FF1900 FF8023 000100 Locked")
+    assert inf.is_valid
+    assert inf.filename == ":0.$.FILE"
+    assert inf.load_addr == 0xFF1900
+    assert inf.exec_addr == 0xFF8023
+    assert inf.size == 0x100
+    assert inf.locked
+
+
+@pytest.mark.parametrize("line", [":9.A.B FF1900 FF8023", ":0A.B FF1900 FF8023"])
+def test_inf_rejects_invalid_drive(line):
+    with pytest.raises(ValueError, match="invalid drive name"):
+        dfsimage.Inf.from_string(line)
+    assert not dfsimage.Inf.from_string(line, no_throw=True).is_valid
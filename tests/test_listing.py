@@ -0,0 +1,39 @@
+# pylint: disable=redefined-outer-name, unused-argument
+# pylint: disable=missing-module-docstring, missing-function-docstring
+import os
+import io
+import json
+
+import pytest
+import dfsimage
+
+FILE_NAMES = ["ZETA", "alpha", "B.BETA", "Gamma", "$.Beta"]
+
+# Capital and small letters are sorted together, directory first
+SORTED_NAMES = ["$.alpha", "$.Beta", "$.Gamma", "$.ZETA", "B.BETA"]
+
+
+@pytest.fixture
+def image_with_files(tmpdir):
+    path = os.path.join(tmpdir, "image.ssd")
+    with dfsimage.Image.create(path) as image:
+        for name in FILE_NAMES:
+            image.add_file(name, name.encode("ascii"))
+    image = dfsimage.Image.open(path)
+    yield image
+    image.close()
+
+
+def test_side_properties_sorted(image_with_files):
+    side = image_with_files.sides[0]
+    attrs = side.get_properties(recurse=True, sort=True)
+    assert [file["fullname"] for file in attrs["files"]] == SORTED_NAMES
+    files = side.get_properties(level=-1, sort=True)
+    assert [file["fullname"] for file in files] == SORTED_NAMES
+
+
+def test_json_listing_sorted(image_with_files):
+    output = io.StringIO()
+    image_with_files.listing(dfsimage.ListFormat.JSON, sort=True, file=output)
+    attrs = json.loads(output.getvalue())
+    assert [file["fullname"] for file in attrs["sides"][0]["files"]] == SORTED_NAMES
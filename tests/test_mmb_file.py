@@ -0,0 +1,96 @@
+# pylint: disable=redefined-outer-name, unused-argument
+# pylint: disable=missing-module-docstring, missing-function-docstring
+import os
+
+import pytest
+import dfsimage
+
+from dfsimage.consts import MMB_INDEX_ENTRY_SIZE, MMB_INDEX_SIZE
+
+DISK_COUNT = 10
+
+
+def read_index(path):
+    with open(path, "rb") as file:
+        return file.read(MMB_INDEX_SIZE)
+
+
+def index_block(index_data, block):
+    return index_data[block * MMB_INDEX_ENTRY_SIZE:(block + 1) * MMB_INDEX_ENTRY_SIZE]
+
+
+@pytest.fixture
+def mmb_path(tmpdir):
+    path = os.path.join(tmpdir, "disks.mmb")
+    with dfsimage.MMBFile.create(path) as mmb:
+        for index in range(DISK_COUNT):
+            entry = mmb.get_entry(index)
+            entry.initialized = True
+            entry.title = "DISK%d" % index
+    yield path
+    os.remove(path)
+
+
+def test_mmb_index_writeback(mmb_path):
+    original = read_index(mmb_path)
+
+    with dfsimage.MMBFile.open(mmb_path, for_write=True) as mmb:
+        mmb.get_entry(2).locked = True
+        mmb.set_onboot(1, 5)
+        mmb.get_entry(7).title = "RENAMED"
+
+    updated = read_index(mmb_path)
+    with dfsimage.MMBFile.open(mmb_path) as mmb:
+        assert mmb.get_entry(2).locked
+        assert mmb.get_onboot(1) == 5
+        assert mmb.get_entry(7).title == "RENAMED"
+
+    # Index blocks are shifted by one - block 0 holds onboot drives
+    for block in range(1, MMB_INDEX_SIZE // MMB_INDEX_ENTRY_SIZE):
+        if block not in (2 + 1, 7 + 1):
+            assert index_block(updated, block) == index_block(original, block)
+
+
+def test_mmb_modified_after_save(mmb_path):
+    with dfsimage.MMBFile.open(mmb_path, for_write=True) as mmb:
+        mmb.get_entry(4).title = "FIRST"
+        mmb.save()
+        assert not mmb.modified
+        mmb.get_entry(9).locked = True
+        assert mmb.modified
+
+    with dfsimage.MMBFile.open(mmb_path) as mmb:
+        assert mmb.get_entry(4).title == "FIRST"
+        assert mmb.get_entry(9).locked
+        assert not mmb.get_entry(8).locked
+
+
+@pytest.fixture
+def mmb_with_files(tmpdir):
+    path = os.path.join(tmpdir, "files.mmb")
+    with dfsimage.MMBFile.create(path) as mmb:
+        for index in range(3):
+            mmb.get_entry(index).initialized = True
+            with mmb.open_entry(index, open_mode=dfsimage.OpenMode.ALWAYS,
+                                warn_mode=dfsimage.WarnMode.NONE) as image:
+                image.format()
+                image.add_file("FILE%d" % index, b"data")
+                image.add_file("OTHER%d" % index, b"other")
+    mmb = dfsimage.MMBFile.open(path)
+    yield mmb
+    mmb.close()
+    os.remove(path)
+
+
+def test_mmb_listing_with_pattern(mmb_with_files, capsys):
+    mmb_with_files.listing(dfsimage.ListFormat.RAW, pattern="FILE*")
+    assert capsys.readouterr().out.split() == ["$.FILE0", "$.FILE1", "$.FILE2"]
+
+
+def test_mmb_properties_with_pattern(mmb_with_files):
+    files = mmb_with_files.get_properties(for_format=False, recurse=True,
+                                          level=-2, pattern="OTHER1")
+    assert [file["fullname"] for file in files] == ["$.OTHER1"]
+    with pytest.raises(FileNotFoundError):
+        mmb_with_files.get_properties(for_format=False, recurse=True,
+                                      level=-2, pattern="NOPE")